@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Content-addressed cache for ffmpeg-produced clips.
+
+A clip's key hashes its source (path + mtime) and everything that shapes the
+encode (filters, duration, encoder args). Hits are hard-linked into place, so
+a repeat run on the same stock/visuals skips ffmpeg entirely. Files in the
+cache are never written in place: callers encode to a temp path and move it
+over `out`, so a linked `out` can't corrupt its cached twin.
+
+The cache lives in $XDG_CACHE_HOME (default ~/.cache)/ai-show-starter/ffmpeg/
+and is trimmed to MAX_BYTES, least recently used (atime, refreshed on each hit) first.
+"""
+from __future__ import annotations
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "ai-show-starter" / "ffmpeg"
+MAX_BYTES = 4 * 1024**3
+
+def key(src: Path, *params) -> str:
+    src = Path(src)
+    h = hashlib.sha1(f"{src.resolve()}|{src.stat().st_mtime_ns}".encode("utf-8"))
+    for p in params:
+        h.update(b"|" + str(p).encode("utf-8"))
+    return h.hexdigest()
+
+def _place(src: Path, dst: Path) -> None:
+    """Hard-link src to dst (replacing dst); copy across filesystems."""
+    try:
+        if os.path.samefile(src, dst):
+            return  # already linked; rename() onto the same inode is a no-op
+    except OSError:
+        pass
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}.tmp")
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+def fetch(k: str, out: Path) -> bool:
+    cached = CACHE_DIR / f"{k}.mp4"
+    if not cached.exists():
+        return False
+    try:
+        os.utime(cached)  # LRU touch
+        out.parent.mkdir(parents=True, exist_ok=True)
+        _place(cached, out)
+    except OSError:
+        return False
+    return True
+
+def store(k: str, produced: Path) -> None:
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _place(produced, CACHE_DIR / f"{k}.mp4")
+    except OSError:
+        return  # cache is best-effort
+    evict()
+
+def evict(max_bytes: int = MAX_BYTES) -> None:
+    try:
+        entries = [(e.stat().st_atime, e.stat().st_size, e) for e in CACHE_DIR.glob("*.mp4")]
+    except OSError:
+        return
+    total = sum(size for _, size, _ in entries)
+    for _, size, e in sorted(entries, key=lambda t: t[0]):
+        if total <= max_bytes:
+            break
+        e.unlink(missing_ok=True)
+        total -= size
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Small ffmpeg helpers shared by the frame-based adapters; the encoder args
+and probe below are also what assembly/ and gen_background encode with.
+
+RawVideoWriter replaces matplotlib's FFMpegWriter: callers hand it finished
+frames (numpy arrays, bytes or memoryviews) and they go straight into
+ffmpeg's stdin as rawvideo — no per-frame PNG/savefig round-trip.
+
+h264_args() picks a hardware H.264 encoder (NVENC, Quick Sync, VideoToolbox)
+when one actually works on this machine, else multi-threaded libx264.
+
+FFMPEG_THREADS (env) caps the threads of each encode; a parent that runs
+several renders at once sets it so N jobs x threads stays under the cores.
+Without it, commands that run N-at-a-time (route_shots renders POOL_WORKERS
+beats at once) size themselves with ffmpeg_thread_budget(N) from the CPUs
+this process may actually use.
+"""
+from __future__ import annotations
+import os
+import subprocess
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+FFMPEG = "ffmpeg"
+FONT = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+@lru_cache(maxsize=None)
+def warm_font(path: str = FONT) -> None:
+    """
+    Pull the drawtext font into the page cache once per process so each short
+    ffmpeg run's FreeType load is a memory read. (drawtext with fontfile= never
+    touches fontconfig, so there is no fontconfig scan to skip.)
+    """
+    try:
+        with open(path, "rb") as f:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            else:
+                f.read()
+    except OSError:
+        pass
+
+NVENC_ARGS = ["-c:v", "h264_nvenc", "-pix_fmt", "yuv420p",
+              "-preset", "p4", "-tune", "hq", "-rc", "vbr", "-cq", "23", "-b:v", "0",
+              "-profile:v", "high"]
+QSV_ARGS = ["-c:v", "h264_qsv", "-pix_fmt", "nv12", "-preset", "veryfast", "-b:v", "6M",
+            "-profile:v", "high"]
+VIDEOTOOLBOX_ARGS = ["-c:v", "h264_videotoolbox", "-pix_fmt", "yuv420p", "-b:v", "6M",
+                     "-profile:v", "high"]
+# no -threads: libx264 sizes itself, or the command's threads_args() sets it once
+X264_ARGS = ["-c:v", "libx264", "-pix_fmt", "yuv420p", "-preset", "veryfast"]
+
+@lru_cache(maxsize=1)
+def hw_h264_args() -> Optional[tuple[str, ...]]:
+    """
+    Args for the first hardware H.264 encoder that can actually encode here,
+    or None. Distro ffmpeg builds list h264_nvenc even without a GPU/driver,
+    so we try a tiny encode instead of grepping `-encoders`. Probed once per
+    process.
+    """
+    for args in (NVENC_ARGS, QSV_ARGS, VIDEOTOOLBOX_ARGS):
+        try:
+            p = subprocess.run(
+                [FFMPEG, "-hide_banner", "-v", "error",
+                 "-f", "lavfi", "-i", "color=c=black:s=256x256:d=0.1",
+                 *args, "-f", "null", "-"],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=20,
+            )
+        except (OSError, subprocess.SubprocessError):
+            continue
+        if p.returncode == 0:
+            return tuple(args)
+    return None
+
+def usable_cores() -> int:
+    """CPUs this process may run on (affinity/cgroup-pinned runners), not the host total."""
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except AttributeError:  # macOS / Windows
+        return os.cpu_count() or 1
+
+# ffmpeg/libx264 already threads internally; half the cores keeps several
+# encodes in flight without oversubscribing the runner.
+POOL_WORKERS = max(1, usable_cores() // 2)
+
+def ffmpeg_thread_budget(nproc: int) -> int:
+    """Threads per ffmpeg when `nproc` of them run at once."""
+    return max(1, usable_cores() // max(1, nproc))
+
+def encode_threads() -> Optional[int]:
+    try:
+        return int(os.environ["FFMPEG_THREADS"]) or None
+    except (KeyError, ValueError):
+        return None
+
+def threads_args(nproc: int = 1) -> list[str]:
+    """
+    -threads/-filter_threads/-filter_complex_threads for one of `nproc`
+    concurrent ffmpegs; empty (ffmpeg's own auto sizing) for a lone process
+    unless FFMPEG_THREADS is set.
+    """
+    n = encode_threads() or (ffmpeg_thread_budget(nproc) if nproc > 1 else None)
+    if not n:
+        return []
+    return ["-threads", str(n), "-filter_threads", str(n), "-filter_complex_threads", str(n)]
+
+def h264_args(tune: Optional[str] = None, fast: bool = False) -> list[str]:
+    """tune (stillimage/film/animation) and fast (x264_fast_args(), for short
+    clips) only apply to the libx264 path."""
+    hw = hw_h264_args()
+    if hw:
+        return list(hw)
+    return [*X264_ARGS, *(["-tune", tune] if tune else []), *(x264_fast_args() if fast else [])]
+
+def x264_fast_args() -> list[str]:
+    """
+    Slice-threaded libx264 for short 1080x1920 clips: frame threads need a
+    pipeline to fill before they pay off, slices put every core on every frame.
+    No thread count here: the command's one -threads comes from threads_args()
+    (or libx264's auto sizing when there is none).
+    """
+    return ["-x264-params", "sliced-threads=1:sync-lookahead=0:rc-lookahead=10:aq-mode=0:no-mbtree=1"]
+
+class RawVideoWriter:
+    """
+    with RawVideoWriter(out_path, fps, (W, H)) as w:
+        for ...: w.write(frame)   # frame: H x W x 3 uint8 (rgb24) or anything buffer-like
+    """
+
+    def __init__(self, out_path: Path, fps: int, size: tuple[int, int], pix_fmt: str = "rgb24"):
+        self.out_path = Path(out_path)
+        self.fps = fps
+        self.size = size
+        self.pix_fmt = pix_fmt
+        self.proc: Optional[subprocess.Popen] = None
+
+    def cmd(self) -> list[str]:
+        w, h = self.size
+        return [
+            FFMPEG, "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", self.pix_fmt, "-s", f"{w}x{h}", "-r", str(self.fps),
+            "-i", "-",
+            "-an", "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p",
+            *threads_args(),
+            str(self.out_path),
+        ]
+
+    def __enter__(self) -> "RawVideoWriter":
+        self.proc = subprocess.Popen(self.cmd(), stdin=subprocess.PIPE)
+        return self
+
+    def write(self, frame) -> None:
+        self.proc.stdin.write(frame)
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            self.proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        rc = self.proc.wait()
+        if rc != 0 and exc_type is None:
+            raise subprocess.CalledProcessError(rc, self.cmd())
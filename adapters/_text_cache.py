@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Content-addressed cache of rasterized text overlays.
+
+drawtext lays out and rasterizes the same string on every frame of every
+render. Titles/keywords repeat a lot across beats and episodes, so we render
+each (text, font, size, color, shadow, spacing) once with PIL into a
+transparent PNG under ~/.cache/ai-show-starter/text/ and let ffmpeg overlay it.
+
+PIL ships with matplotlib/moviepy; if it's missing, `available()` is False and
+callers keep their drawtext path.
+"""
+from __future__ import annotations
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:  # pragma: no cover - optional
+    Image = ImageDraw = ImageFont = None
+
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "ai-show-starter" / "text"
+
+RGBA = tuple[int, int, int, int]
+Shadow = tuple[RGBA, int, int]  # (color, dx, dy)
+
+def available() -> bool:
+    return Image is not None
+
+def rasterize(
+    text: str,
+    font: str,
+    size: int,
+    color: RGBA = (255, 255, 255, 255),
+    shadow: Optional[Shadow] = None,
+    line_spacing: int = 0,
+) -> Optional[Path]:
+    """
+    Transparent PNG of `text` (multi-line, left-aligned like drawtext); None for
+    blank text. The image is cropped to the text block, so center it with
+    overlay=x=(W-w)/2.
+    """
+    if not text.strip():
+        return None
+    key = hashlib.blake2b(
+        repr((text, font, size, color, shadow, line_spacing)).encode("utf-8"), digest_size=16
+    ).hexdigest()
+    png = CACHE_DIR / f"{key}.png"
+    if png.exists():
+        return png
+
+    ft = ImageFont.truetype(font, size)
+    x0, _, x1, y1 = ImageDraw.Draw(Image.new("L", (1, 1))).multiline_textbbox(
+        (0, 0), text, font=ft, spacing=line_spacing
+    )
+    dx, dy = (shadow[1], shadow[2]) if shadow else (0, 0)
+    img = Image.new("RGBA", (x1 - x0 + abs(dx), y1 + abs(dy)), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    ox, oy = -x0 + max(0, -dx), max(0, -dy)
+    if shadow:
+        draw.multiline_text((ox + dx, oy + dy), text, font=ft, fill=shadow[0], spacing=line_spacing)
+    draw.multiline_text((ox, oy), text, font=ft, fill=color, spacing=line_spacing)
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = png.with_suffix(f".{os.getpid()}.tmp")
+    img.save(tmp, format="PNG")
+    os.replace(tmp, png)
+    return png
@@ -7,57 +7,124 @@ Card adapter (robust + deterministic):
 """
 
 from __future__ import annotations
-import glob
+import os
 import re
 import subprocess
-import tempfile
 from pathlib import Path
 from typing import List, Optional
 
+try:
+    from adapters import _text_cache
+    from adapters._ffmpeg import POOL_WORKERS, h264_args, threads_args, warm_font
+except ImportError:  # adapters/ itself on sys.path
+    import _text_cache
+    from _ffmpeg import POOL_WORKERS, h264_args, threads_args, warm_font
+
 FFMPEG = "ffmpeg"
 FONT = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+TEXT_SHADOW = ((0, 0, 0, 128), 2, 2)  # black@0.5, 2px down-right
+
+VIDEO_EXTS = (".mp4", ".mov")
+_TOKEN_SPLIT = re.compile(r"[^a-z0-9]+")
+_WS_RE = re.compile(r"[^\S\n]+")
+_DT_ESC = re.compile(r"([\\%])")
+_OPT_ESC = re.compile(r"([\\':])")
+_GRAPH_ESC = re.compile(r"([\\'\[\],;])")
+# every ASCII case where _WS_RE would change something (str \s also matches \x1c-\x1f)
+_WS_TRIGGERS = ("  ", "\t", "\x0b", "\x0c", "\x1c", "\x1d", "\x1e", "\x1f")
+
+Candidate = tuple[Path, frozenset[str]]
+
+# resolved stock_dir -> (st_mtime_ns of every directory under it, clips with
+# their name tokens ordered by (name, path)). A hit is re-validated by stat-ing
+# those directories only, so a clip added to or removed from any
+# subdirectory (or a new/removed subdirectory) triggers a rescan.
+_CANDIDATE_CACHE: dict[Path, tuple[dict[str, int], list[Candidate]]] = {}
+
+def _tokens(s: str) -> frozenset[str]:
+    return frozenset(t for t in _TOKEN_SPLIT.split(s.lower()) if t)
 
-def _gather_candidates(stock_dir: Path) -> list[Path]:
-    if not stock_dir or not stock_dir.exists():
+def _scan_videos(root: Path) -> tuple[dict[str, int], list[Candidate]]:
+    """
+    One recursive scandir pass; DirEntry type checks reuse the dirent, no stat
+    per file. Also returns each visited directory's mtime, taken before it is
+    listed, so a change made mid-scan still invalidates the result.
+    """
+    found: list[Path] = []
+    dirs: dict[str, int] = {}
+    stack = [str(root)]
+    while stack:
+        d = stack.pop()
+        try:
+            dirs[d] = os.stat(d).st_mtime_ns
+            it = os.scandir(d)
+        except OSError:
+            continue
+        with it:
+            for e in it:
+                if e.name.startswith("."):
+                    continue  # glob("**") never matched hidden entries either
+                if e.is_dir():
+                    stack.append(e.path)
+                elif e.is_file() and e.name.lower().endswith(VIDEO_EXTS):
+                    found.append(Path(e.path))
+    found.sort(key=lambda p: (p.name, p))
+    return dirs, [(p, _tokens(p.stem)) for p in found]
+
+def _unchanged(dirs: dict[str, int]) -> bool:
+    try:
+        return all(os.stat(d).st_mtime_ns == m for d, m in dirs.items())
+    except OSError:
+        return False
+
+def _gather_candidates(stock_dir: Path) -> list[Candidate]:
+    if not stock_dir:
         return []
-    patterns = [
-        str(stock_dir / "**/*.mp4"),
-        str(stock_dir / "**/*.MP4"),
-        str(stock_dir / "**/*.mov"),
-        str(stock_dir / "**/*.MOV"),
-    ]
-    files: list[Path] = []
-    for pat in patterns:
-        files.extend(Path(p) for p in glob.glob(pat, recursive=True))
-    uniq = sorted({p.resolve() for p in files if p.is_file()})
-    return uniq
+    try:
+        root = Path(stock_dir).resolve()
+    except OSError:
+        return []
+    hit = _CANDIDATE_CACHE.get(root)
+    if hit is None or not _unchanged(hit[0]):
+        hit = _scan_videos(root)
+        if not hit[0]:
+            return []  # stock_dir missing/unreadable: nothing to cache
+        _CANDIDATE_CACHE[root] = hit
+    return hit[1]
 
 def _pick_stock_clip(stock_dir: Path, keywords: List[str]) -> Optional[Path]:
     candidates = _gather_candidates(stock_dir)
     if not candidates:
         print(f"[card] no stock candidates under: {stock_dir}")
         return None
-    kw_norm = [k.lower() for k in (keywords or []) if isinstance(k, str)]
-    scored = []
-    for p in candidates:
-        name = p.name.lower()
-        score = sum(1 for k in kw_norm if k and k in name)
-        scored.append((score, p))
-    scored.sort(key=lambda x: (-x[0], x[1].name))
-    best_score, best_path = scored[0]
+    kw_set = frozenset().union(*(_tokens(k) for k in (keywords or []) if isinstance(k, str)))
+    if kw_set:
+        # candidates are name-ordered, so max() keeps the first (lowest name) on ties
+        best_path, toks = max(candidates, key=lambda c: len(kw_set & c[1]))
+        best_score = len(kw_set & toks)
+    else:
+        best_path, best_score = candidates[0][0], 0
     print(f"[card] auto-pick stock: candidates={len(candidates)} best_score={best_score} picked={best_path}")
     return best_path
 
 def _safe_txt(s: str) -> str:
+    if not s:
+        return ""
     s = s.replace("\r\n", "\n").replace("\r", "\n")
-    s = re.sub(r"[^\S\n]+", " ", s)
+    # Only run the regex when there is something to collapse (runs/tabs/odd spaces).
+    if not s.isascii() or any(w in s for w in _WS_TRIGGERS):
+        s = _WS_RE.sub(" ", s)
     return s.strip()
 
-def _write_text_tmp(content: str) -> Path:
-    tmp = tempfile.NamedTemporaryFile("w", delete=False, encoding="utf-8", suffix=".txt")
-    with tmp as f:
-        f.write(content)
-    return Path(tmp.name)
+def _ff_escape(s: str) -> str:
+    """
+    Inline drawtext text= value: escape for drawtext's own expansion (\\ %),
+    then the option parser (\\ ' :), then the filtergraph parser (\\ ' [ ] , ;).
+    Newlines stay literal; drawtext breaks lines on them.
+    """
+    s = _DT_ESC.sub(r"\\\1", s)
+    s = _OPT_ESC.sub(r"\\\1", s)
+    return _GRAPH_ESC.sub(r"\\\1", s)
 
 def _wrap_bullets(keywords: List[str], max_bullets: int = 4) -> str:
     if not keywords:
@@ -122,8 +189,6 @@ def render(
 
     title_text = _safe_txt(title or text or "")
     bullets_text = _safe_txt(_wrap_bullets(keywords))
-    title_file = _write_text_tmp(title_text)
-    bullets_file = _write_text_tmp(bullets_text)
 
     scale_bg = f"scale={W}:{H},format=yuv420p"
     shadow = f"drawbox=x={card_x+12}:y={card_y+16}:w={card_w}:h={card_h}:t=20:color=black@0.35"
@@ -136,41 +201,53 @@ def render(
     )
     overlay_clip = f"overlay=x={panel_x}:y={panel_y}:format=auto"
 
-    title_draw = (
-        f"drawtext=fontfile='{FONT}':textfile='{title_file}':"
-        f"fontcolor=white:fontsize={title_size}:x=(w-text_w)/2:y={title_y}:"
-        f"shadowcolor=black@0.5:shadowx=2:shadowy=2:line_spacing=6"
-    )
-    bullets_draw = (
-        f"drawtext=fontfile='{FONT}':textfile='{bullets_file}':"
-        f"fontcolor=white:fontsize={bullet_size}:x=(w-text_w)/2:y={bullets_y}:"
-        f"shadowcolor=black@0.5:shadowx=2:shadowy=2:line_spacing=10"
-    )
+    inputs = ["-i", str(bg_path), "-i", str(clip_path)]
+    graph = [
+        f"[0:v]{scale_bg},{shadow},{fill},{border}[bg]",
+        f"[1:v]{clip_fit}[clipf]",
+        f"[bg][clipf]{overlay_clip}[v1]",
+    ]
+    last = "v1"
+
+    if _text_cache.available():
+        # Pre-rasterized (and cached) text PNGs; overlay holds the single frame.
+        texts = [
+            (title_text, title_size, 6, title_y),
+            (bullets_text, bullet_size, 10, bullets_y),
+        ]
+        for txt, size, spacing, y in texts:
+            png = _text_cache.rasterize(txt, FONT, size, shadow=TEXT_SHADOW, line_spacing=spacing)
+            if png is None:
+                continue
+            k = len(inputs) // 2
+            inputs += ["-i", str(png)]
+            graph.append(f"[{last}][{k}:v]overlay=x=(W-w)/2:y={y}[v{k}]")
+            last = f"v{k}"
+    else:
+        warm_font(FONT)  # drawtext font into the page cache, once per process
+        title_draw = (
+            f"drawtext=fontfile='{FONT}':text={_ff_escape(title_text)}:"
+            f"fontcolor=white:fontsize={title_size}:x=(w-text_w)/2:y={title_y}:"
+            f"shadowcolor=black@0.5:shadowx=2:shadowy=2:line_spacing=6"
+        )
+        bullets_draw = (
+            f"drawtext=fontfile='{FONT}':text={_ff_escape(bullets_text)}:"
+            f"fontcolor=white:fontsize={bullet_size}:x=(w-text_w)/2:y={bullets_y}:"
+            f"shadowcolor=black@0.5:shadowx=2:shadowy=2:line_spacing=10"
+        )
+        graph += [f"[v1]{title_draw}[v2]", f"[v2]{bullets_draw}[v3]"]
+        last = "v3"
 
-    filter_complex = (
-        f"[0:v]{scale_bg},{shadow},{fill},{border}[bg];"
-        f"[1:v]{clip_fit}[clipf];"
-        f"[bg][clipf]{overlay_clip}[v1];"
-        f"[v1]{title_draw}[v2];"
-        f"[v2]{bullets_draw}[vout]"
-    )
     cmd = [
         FFMPEG, "-y",
-        "-i", str(bg_path),
-        "-i", str(clip_path),
-        "-filter_complex", filter_complex,
-        "-map", "[vout]",
+        *inputs,
+        "-filter_complex", ";".join(graph),
+        "-map", f"[{last}]",
         "-t", f"{duration:.2f}",
-        "-c:v", "libx264", "-pix_fmt", "yuv420p",
-        "-profile:v", "high", "-level", "4.0", "-preset", "veryfast",
+        *h264_args(fast=True),
+        *threads_args(POOL_WORKERS),
         "-movflags", "+faststart",
         str(out_path),
     ]
 
-    try:
-        _run(cmd)
-    finally:
-        try: title_file.unlink(missing_ok=True)
-        except Exception: pass
-        try: bullets_file.unlink(missing_ok=True)
-        except Exception: pass
+    _run(cmd)
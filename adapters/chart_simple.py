@@ -1,18 +1,45 @@
 # -*- coding: utf-8 -*-
 """
 Simple charts (bar/line) with animated reveal using matplotlib.
+
+matplotlib draws the static chart (axes, ticks, title) exactly once; the bar
+growth is closed-form, so each frame is just numpy fills of the bar rectangles
+on top of that background, piped to ffmpeg as raw rgb24. The Figure/Axes are
+kept at module level and cleared between beats rather than rebuilt.
 """
 from __future__ import annotations
 import random
 from pathlib import Path
+from typing import Optional
+import numpy as np
 import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
-from matplotlib.animation import FFMpegWriter
+from matplotlib.axes import Axes
+from matplotlib.colors import to_rgb
+from matplotlib.figure import Figure
+
+try:
+    from adapters._ffmpeg import RawVideoWriter
+except ImportError:  # adapters/ itself on sys.path
+    from _ffmpeg import RawVideoWriter
 
 W, H = 1080, 1920
 DPI = 100
 FIGSIZE = (W / DPI, H / DPI)
+BAR_COLOR = "#67e8f9"
+
+_FIG: Optional[Figure] = None
+
+def _axes() -> Axes:
+    """The shared chart Axes, cleared for a new beat."""
+    global _FIG
+    if _FIG is None:
+        _FIG = plt.figure(figsize=FIGSIZE, dpi=DPI)
+        return _FIG.add_subplot(111)
+    ax = _FIG.axes[0]
+    ax.clear()
+    return ax
 
 def render(text: str, out_path: Path, duration: float = 6.0, fps: int = 24) -> None:
     out_path = Path(out_path)
@@ -24,22 +51,36 @@ def render(text: str, out_path: Path, duration: float = 6.0, fps: int = 24) -> N
     vals = [random.randint(3, 10) for _ in range(n)]
     labels = [f"c{i+1}" for i in range(n)]
 
-    fig = plt.figure(figsize=FIGSIZE, dpi=DPI)
-    ax = fig.add_subplot(111)
+    ax = _axes()
+    fig = ax.figure
     ax.set_facecolor("#101426")
     ax.tick_params(colors="white")
     for s in ax.spines.values():
         s.set_color("white")
     ax.set_ylim(0, max(vals) + 2)
-    bars = ax.bar(labels, [0]*n, color="#67e8f9")
+    bars = ax.bar(labels, [0]*n, color=BAR_COLOR)
     ax.set_title(text[:80], color="white", fontsize=16)
 
+    # Static background (zero-height bars) + bar geometry in pixel rows/cols.
+    # Display coords have their origin bottom-left; image rows count from the top.
+    fig.canvas.draw()
+    frame = np.asarray(fig.canvas.buffer_rgba())[:, :, :3].copy()
+    to_px = ax.transData.transform
+    (_, y0), (_, y1) = to_px([(0, 0), (0, 1)])
+    base_row = H - int(round(y0))
+    cols = []
+    for b in bars:
+        (x0, _), (x1, _) = to_px([(b.get_x(), 0), (b.get_x() + b.get_width(), 0)])
+        cols.append((int(round(x0)), int(round(x1))))
+
     frames = max(int(duration*fps), 12)
-    writer = FFMpegWriter(fps=fps, metadata={"title":"Chart"}, bitrate=2000)
-    with writer.saving(fig, str(out_path), DPI):
+    t = np.arange(1, frames + 1) / frames
+    tops = base_row - np.rint(np.outer(t, vals) * (y1 - y0)).astype(int)  # (frames, n)
+    color = np.array([round(c * 255) for c in to_rgb(BAR_COLOR)], dtype=np.uint8)
+
+    # Bars only grow, so painting the new extent over the previous frame is enough.
+    with RawVideoWriter(out_path, fps, (W, H)) as writer:
         for k in range(frames):
-            t = (k+1)/frames
-            for bi, b in enumerate(bars):
-                b.set_height(vals[bi]*t)
-            writer.grab_frame()
-    plt.close(fig)
+            for (c0, c1), top in zip(cols, tops[k]):
+                frame[top:base_row, c0:c1] = color
+            writer.write(frame)
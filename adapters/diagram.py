@@ -1,5 +1,10 @@
-from pathlib import Path
 import subprocess
+from pathlib import Path
+
+try:
+    from adapters._ffmpeg import POOL_WORKERS, h264_args, threads_args, warm_font
+except ImportError:  # adapters/ itself on sys.path
+    from _ffmpeg import POOL_WORKERS, h264_args, threads_args, warm_font
 
 FFMPEG = "ffmpeg"
 
@@ -14,6 +19,7 @@ def make(beat: dict, idx: int, ep_dir: Path) -> Path:
     kws = beat.get("keywords") or []
     block = " • " + "\\n • ".join(kws) if kws else "DIAGRAM"
     overlay = ("DIAGRAM\\n" + block).replace("'", "\\'")
+    warm_font()  # drawtext font into the page cache, once per process
     cmd = [
         FFMPEG, "-y",
         "-i", str(bg),
@@ -21,8 +27,9 @@ def make(beat: dict, idx: int, ep_dir: Path) -> Path:
         f"format=yuv420p,drawtext=fontfile=/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf:"
         f"text='{overlay}':line_spacing=12:fontcolor=white:fontsize=46:x=(w-text_w)/2:y=(h-text_h)/2",
         "-t", str(max(1.5, beat.get('dur', 5.0))),
-        "-c:v", "libx264", "-pix_fmt", "yuv420p",
+        *h264_args(fast=True),
+        *threads_args(POOL_WORKERS),
         str(out)
     ]
-    subprocess.check_call(cmd)
+    subprocess.run(cmd, check=True)
     return out
@@ -1,7 +1,12 @@
 # adapters/diagram_basic.py
-import subprocess, shlex
+import subprocess
 from pathlib import Path
 
+try:
+    from adapters._ffmpeg import h264_args, threads_args, warm_font
+except ImportError:  # adapters/ itself on sys.path
+    from _ffmpeg import h264_args, threads_args, warm_font
+
 FFMPEG = "ffmpeg"
 
 def make_diagram(text: str, keywords, out: Path, dur: float):
@@ -19,9 +24,12 @@ def make_diagram(text: str, keywords, out: Path, dur: float):
         "drawtext=fontfile=/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf:"
         f"text='{caption}':fontcolor=white:fontsize=52:x=(w-text_w)/2:y=(h-text_h)/2"
     ]
-    vf = "format=yuv420p," + ",".join(draw)
-    cmd = f"{FFMPEG} -y -f lavfi -i color=c=0x0e1116:s=1080x1920:r=30 -t {dur:.3f} -vf \"{vf}\" -an {shlex.quote(str(out))}"
-    proc = subprocess.run(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    # The card is static: draw one frame, then loop it (drawtext runs once, not dur*30 times).
+    vf = "format=yuv420p," + ",".join(draw) + ",trim=end_frame=1,loop=loop=-1:size=1:start=0,fps=30"
+    warm_font()  # drawtext font into the page cache, once per process
+    cmd = [FFMPEG, "-y", "-f", "lavfi", "-i", "color=c=0x0e1116:s=1080x1920:r=30", "-vf", vf, "-t", f"{dur:.3f}",
+           *h264_args(tune="stillimage", fast=True), *threads_args(), "-an", str(out)]
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
     print(proc.stdout)
     if proc.returncode != 0:
         raise SystemExit("[diagram] ffmpeg failed")
@@ -1,20 +1,93 @@
 # -*- coding: utf-8 -*-
 """
-Graphviz flow diagram → PNG → subtle pan in matplotlib movie (keeps everything in-Python).
+Graphviz flow diagram → PNG → slow zoom-in rendered by ffmpeg (zoompan).
 Requires system 'graphviz' and Python package 'graphviz' (vendor wheel or pip).
+If `pygraphviz` is installed, layout runs in-process (libgvc) instead of
+forking `dot`.
+
+The PNG is content-addressed on disk (same bullets → same graph) and memoized
+per process, so repeat renders skip layout entirely. The matplotlib loop is
+only used if the ffmpeg zoompan pass fails.
 """
 from __future__ import annotations
-import tempfile
+import hashlib
+import os
+import subprocess
+from functools import lru_cache
 from pathlib import Path
 import graphviz
 import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
-from matplotlib.animation import FFMpegWriter
 
+try:
+    from adapters._ffmpeg import POOL_WORKERS, RawVideoWriter, threads_args
+except ImportError:  # adapters/ itself on sys.path
+    from _ffmpeg import POOL_WORKERS, RawVideoWriter, threads_args
+
+try:
+    import pygraphviz  # optional: in-process layout, no `dot` fork
+except ImportError:
+    pygraphviz = None
+
+FFMPEG = "ffmpeg"
 W, H = 1080, 1920
 DPI = 100
 FIGSIZE = (W / DPI, H / DPI)
+BG_HEX = "0x101426"
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "ai-show-starter"
+
+def _render_png(source: str) -> bytes:
+    if pygraphviz is not None:
+        return pygraphviz.AGraph(string=source).draw(format="png", prog="dot")
+    return graphviz.Source(source).pipe(format="png")
+
+@lru_cache(maxsize=256)
+def _flow_png(source: str) -> Path:
+    """Lay out dot source → PNG once per distinct graph; later calls are a dict hit."""
+    key = hashlib.blake2b(source.encode("utf-8"), digest_size=16).hexdigest()
+    png = CACHE_DIR / f"flow_{key}.png"
+    if not png.exists():
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = png.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(_render_png(source))
+        os.replace(tmp, png)
+    return png
+
+def _zoompan_cmd(png: Path, out_path: Path, frames: int, fps: int) -> list[str]:
+    # Fit the graph inside the portrait frame on the dark bg, then zoom 1.05 → 1.10.
+    graph = (
+        f"[1:v]scale=w={W-120}:h={H-320}:force_original_aspect_ratio=decrease[g];"
+        f"[0:v][g]overlay=x=(W-w)/2:y=(H-h)/2:format=auto,"
+        f"zoompan=z='1.05+0.05*on/{frames}':x='iw/2-iw/zoom/2':y='ih/2-ih/zoom/2':"
+        f"d={frames}:s={W}x{H}:fps={fps},format=yuv420p[vout]"
+    )
+    return [
+        FFMPEG, "-y",
+        "-f", "lavfi", "-i", f"color=c={BG_HEX}:s={W}x{H}:r=1:d=1",
+        "-i", str(png),
+        "-filter_complex", graph,
+        "-map", "[vout]", "-frames:v", str(frames),
+        "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p",
+        *threads_args(POOL_WORKERS),
+        str(out_path),
+    ]
+
+def _render_matplotlib(png: Path, out_path: Path, frames: int, fps: int) -> None:
+    fig = plt.figure(figsize=FIGSIZE, dpi=DPI)
+    ax = fig.add_subplot(111)
+    ax.set_facecolor("#101426"); ax.axis("off")
+    img = plt.imread(str(png))
+    im = ax.imshow(img, extent=[0,1,0,1])
+
+    with RawVideoWriter(out_path, fps, (W, H), pix_fmt="rgba") as writer:
+        for k in range(frames):
+            # slow zoom-in
+            z = 1.05 + 0.05 * (k/frames)
+            im.set_extent([0.5-0.5/z, 0.5+0.5/z, 0.5-0.5/z, 0.5+0.5/z])
+            fig.canvas.draw()
+            writer.write(fig.canvas.buffer_rgba())
+    plt.close(fig)
 
 def render(text: str, out_path: Path, duration: float = 6.0, fps: int = 24) -> None:
     out_path = Path(out_path)
@@ -34,21 +107,12 @@ def render(text: str, out_path: Path, duration: float = 6.0, fps: int = 24) -> N
         dot.edge(prev, nid, color="white")
         prev = nid
 
-    with tempfile.TemporaryDirectory() as td:
-        png_path = Path(dot.render(directory=td, cleanup=True))
-        # 2) Simple pan animation in matplotlib
-        fig = plt.figure(figsize=FIGSIZE, dpi=DPI)
-        ax = fig.add_subplot(111)
-        ax.set_facecolor("#101426"); ax.axis("off")
-        img = plt.imread(str(png_path))
-        im = ax.imshow(img, extent=[0,1,0,1])
-
-        frames = max(int(duration*fps), 12)
-        writer = FFMpegWriter(fps=fps, metadata={"title":"Flow"}, bitrate=2000)
-        with writer.saving(fig, str(out_path), DPI):
-            for k in range(frames):
-                # slow zoom-in
-                z = 1.05 + 0.05 * (k/frames)
-                im.set_extent([0.5-0.5/z, 0.5+0.5/z, 0.5-0.5/z, 0.5+0.5/z])
-                writer.grab_frame()
-        plt.close(fig)
+    png_path = _flow_png(dot.source)
+
+    # 2) Slow zoom in a single ffmpeg pass
+    frames = max(int(duration*fps), 12)
+    try:
+        subprocess.run(_zoompan_cmd(png_path, out_path, frames, fps), check=True)
+    except subprocess.CalledProcessError as e:
+        print(f"[flow] zoompan failed ({e.returncode}); falling back to matplotlib frames")
+        _render_matplotlib(png_path, out_path, frames, fps)
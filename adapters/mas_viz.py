@@ -1,69 +1,94 @@
 # -*- coding: utf-8 -*-
 """
-Multi-Agent Systems visuals (matplotlib + simple sim).
+Multi-Agent Systems visuals (numpy + Pillow + simple sim).
 We draw a small agent graph and animate message "pulses" along edges.
+
+The scene is just dots, lines and a caption, so there is no plotting library
+in the loop: the static graph is rasterized once per process with
+PIL.ImageDraw, the title is added once per beat, and each frame is a copy of
+that base with the pulse dot drawn on top, piped to ffmpeg as rgb24.
 """
 from __future__ import annotations
-import math, random
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-from matplotlib.animation import FFMpegWriter
+from typing import Optional
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+try:
+    from adapters._ffmpeg import FONT, RawVideoWriter
+except ImportError:  # adapters/ itself on sys.path
+    from _ffmpeg import FONT, RawVideoWriter
 
 W, H = 1080, 1920
-DPI = 100
-FIGSIZE = (W / DPI, H / DPI)
+BG = (16, 20, 38)          # #101426
+NODE = (226, 232, 240)     # #e2e8f0
+LABEL = (148, 163, 184)    # #94a3b8
+EDGE = (51, 65, 85)        # #334155
+PULSE = (103, 232, 249)    # #67e8f9
+NODE_R, PULSE_R = 8, 5
+SCALE = W * 0.35           # layout units → pixels
+
+@lru_cache(maxsize=16)
+def _layout(n: int) -> np.ndarray:
+    # Circular layout for simplicity: (n, 2) unit-circle coordinates
+    theta = 2 * np.pi * np.arange(n) / n
+    return np.stack([np.cos(theta), np.sin(theta)], axis=1)
+
+def _px(pts: np.ndarray) -> np.ndarray:
+    """Layout units → integer pixel coordinates (y grows downwards)."""
+    return np.rint(np.column_stack([W / 2 + pts[:, 0] * SCALE, H / 2 - pts[:, 1] * SCALE])).astype(int)
+
+def _font(size: int):
+    try:
+        return ImageFont.truetype(FONT, size)
+    except OSError:
+        return ImageFont.load_default()
+
+# Simple graph: ring + one chord
+N = 6
+PTS = _px(_layout(N))
+EDGES = [(i, (i+1) % N) for i in range(N)] + [(0, 3)]
 
-def _layout(n: int) -> List[Tuple[float,float]]:
-    # Circular layout for simplicity
-    return [(math.cos(2*math.pi*i/n), math.sin(2*math.pi*i/n)) for i in range(n)]
+_BASE: Optional[Image.Image] = None
+
+def _base() -> Image.Image:
+    """The agent graph is the same for every beat: rasterize it once per process."""
+    global _BASE
+    if _BASE is not None:
+        return _BASE
+
+    img = Image.new("RGB", (W, H), BG)
+    draw = ImageDraw.Draw(img)
+    for i, j in EDGES:
+        draw.line([tuple(PTS[i].tolist()), tuple(PTS[j].tolist())], fill=EDGE, width=3)
+    label_font = _font(14)
+    for i, (px, py) in enumerate(PTS.tolist()):
+        draw.ellipse((px-NODE_R, py-NODE_R, px+NODE_R, py+NODE_R), fill=NODE)
+        draw.text((px, py + NODE_R + 6), f"A{i+1}", fill=LABEL, font=label_font, anchor="mt")
+
+    _BASE = img
+    return _BASE
 
 def render(text: str, out_path: Path, duration: float = 6.0, fps: int = 24) -> None:
     out_path = Path(out_path)
-    fig = plt.figure(figsize=FIGSIZE, dpi=DPI)
-    ax = fig.add_subplot(111)
-    ax.set_xlim(-1.3, 1.3)
-    ax.set_ylim(-2.2, 2.2)
-    ax.set_aspect("equal")
-    ax.set_facecolor("#101426")
-    ax.axis("off")
-
-    txt = ax.text(0.5, 0.95, text[:90], ha="center", va="top", color="white",
-                  transform=ax.transAxes, fontsize=16)
-
-    # Simple graph
-    n = 6
-    pts = _layout(n)
-    edges = [(i, (i+1) % n) for i in range(n)] + [(0, 3)]  # ring + one chord
-
-    # draw nodes & edges
-    for i, (x,y) in enumerate(pts):
-        ax.plot([x],[y], marker="o", markersize=12, color="#e2e8f0")
-        ax.text(x, y-0.12, f"A{i+1}", color="#94a3b8", ha="center", va="top", fontsize=10)
-    for i,j in edges:
-        x1,y1 = pts[i]; x2,y2 = pts[j]
-        ax.plot([x1,x2], [y1,y2], color="#334155", linewidth=2)
+    base = _base().copy()
+    ImageDraw.Draw(base).text((W // 2, 90), text[:90], fill="white", font=_font(22), anchor="mt")
 
     # Pulse animation along edges
     frames = max(int(duration * fps), 12)
-    writer = FFMpegWriter(fps=fps, metadata={"title": "MAS Viz"}, bitrate=2400)
 
     # pre-pick pulse path (edge list)
-    path = edges * 4
-
-    pulse, = ax.plot([pts[0][0]], [pts[0][1]], marker="o", markersize=8, color="#67e8f9")
-
-    def interp(a, b, t):
-        return (a[0]*(1-t)+b[0]*t, a[1]*(1-t)+b[1]*t)
-
-    with writer.saving(fig, str(out_path), DPI):
-        for k in range(frames):
-            eidx = (k // 8) % len(path)
-            i, j = path[eidx]
-            t = (k % 8)/8.0
-            x, y = interp(pts[i], pts[j], t)
-            pulse.set_data([x], [y])
-            writer.grab_frame()
-    plt.close(fig)
+    path = EDGES * 4
+
+    # Pulse pixel position for every frame up front: 8 frames per edge, lerp A→B.
+    f = np.arange(frames)
+    hops = np.array(path)[(f // 8) % len(path)]     # (frames, 2) node indices
+    t = ((f % 8) / 8.0)[:, None]
+    XY = np.rint(PTS[hops[:, 0]] * (1 - t) + PTS[hops[:, 1]] * t).astype(int)
+
+    with RawVideoWriter(out_path, fps, (W, H)) as writer:
+        for px, py in XY.tolist():
+            img = base.copy()
+            ImageDraw.Draw(img).ellipse((px-PULSE_R, py-PULSE_R, px+PULSE_R, py+PULSE_R), fill=PULSE)
+            writer.write(img.tobytes())
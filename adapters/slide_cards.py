@@ -1,7 +1,12 @@
 # adapters/slide_cards.py
-import subprocess, shlex
+import subprocess
 from pathlib import Path
 
+try:
+    from adapters._ffmpeg import h264_args, threads_args
+except ImportError:  # adapters/ itself on sys.path
+    from _ffmpeg import h264_args, threads_args
+
 FFMPEG = "ffmpeg"
 
 def make_slide(text: str, out: Path, dur: float, title: str = ""):
@@ -20,9 +25,12 @@ def make_slide(text: str, out: Path, dur: float, title: str = ""):
         f"text='{overlay}':fontcolor=white:fontsize=48:"
         "x=(w-text_w)/2:y=(h-text_h)/2"
     )
-    vf = "format=yuv420p," + ",".join(draw)
-    cmd = f"{FFMPEG} -y -f lavfi -i color=c=0x101426:s=1080x1920:r=30 -t {dur:.3f} -vf \"{vf}\" -an {shlex.quote(str(out))}"
-    proc = subprocess.run(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-    print(proc.stdout)
-    if proc.returncode != 0:
+    vf = ",".join(draw) + ",format=yuv420p"  # one pixel-format conversion, at the end
+    cmd = [FFMPEG, "-y", "-f", "lavfi", "-i", "color=c=0x101426:s=1080x1920:r=30",
+           "-t", f"{dur:.3f}", "-vf", vf, *h264_args(tune="stillimage"), "-g", "300", "-bf", "3",
+           *threads_args(), "-movflags", "+faststart", "-an", str(out)]
+    try:
+        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    except subprocess.CalledProcessError as e:
+        print(e.stderr)
         raise SystemExit("[slide] ffmpeg failed")
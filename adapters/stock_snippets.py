@@ -1,7 +1,15 @@
 # adapters/stock_snippets.py
-import subprocess, shlex, random
+import os, subprocess, random
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    from adapters import _clip_cache
+    from adapters._ffmpeg import h264_args, threads_args
+except ImportError:  # adapters/ itself on sys.path
+    import _clip_cache
+    from _ffmpeg import h264_args, threads_args
+
 FFMPEG = "ffmpeg"
 FFPROBE = "ffprobe"
 
@@ -15,8 +23,16 @@ def _probe_duration(path: Path) -> float:
     except Exception:
         return 0.0
 
+@lru_cache(maxsize=8)
+def _list_mp4(dirname: str, mtime_ns: int):
+    # mtime_ns is only part of the key: adding/removing a clip bumps it
+    return tuple(Path(dirname).glob("*.mp4"))
+
 def _pick_candidate(assets_dir: Path, keywords):
-    files = list(assets_dir.glob("*.mp4"))
+    try:
+        files = _list_mp4(str(assets_dir), os.stat(assets_dir).st_mtime_ns)
+    except OSError:
+        return None
     if not files:
         return None
     # naive keyword scoring over filename
@@ -27,8 +43,7 @@ def _pick_candidate(assets_dir: Path, keywords):
         # prefer pexels/pixabay videos
         pref = 1 if ("pexels" in name or "pixabay" in name) else 0
         return (hits, pref)
-    files.sort(key=score, reverse=True)
-    return files[-1] if files else None
+    return max(files, key=score)
 
 def make_stock_snip(assets_dir: Path, keywords, out: Path, dur: float):
     out.parent.mkdir(parents=True, exist_ok=True)
@@ -38,7 +53,19 @@ def make_stock_snip(assets_dir: Path, keywords, out: Path, dur: float):
 
     # Normalize to vertical 1080x1920 and trim/pad to duration
     vf = "scale=1080:1920:force_original_aspect_ratio=increase,crop=1080:1920,setsar=1,fps=30,format=yuv420p"
-    cmd = f'{FFMPEG} -y -i {shlex.quote(str(candidate))} -t {dur:.3f} -vf "{vf}" -an {shlex.quote(str(out))}'
-    proc = subprocess.run(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-    print(proc.stdout)
-    return proc.returncode == 0
+    enc = h264_args(tune="film")
+    key = _clip_cache.key(candidate, vf, f"{dur:.3f}", *enc)
+    if _clip_cache.fetch(key, out):
+        return True
+
+    part = out.with_name(f".{out.stem}.part.mp4")
+    cmd = [FFMPEG, "-y", "-i", str(candidate), "-t", f"{dur:.3f}", "-vf", vf, *enc,
+           *threads_args(), "-movflags", "+faststart", "-an", str(part)]
+    proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if proc.returncode != 0:
+        print(proc.stderr)
+        part.unlink(missing_ok=True)
+        return False
+    part.replace(out)
+    _clip_cache.store(key, out)
+    return True
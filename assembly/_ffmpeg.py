@@ -0,0 +1,29 @@
+# assembly/_ffmpeg.py
+"""
+Encoder selection shared by the assembly scripts.
+
+h264_args() and threads_args(n) are the adapters' (adapters/_ffmpeg.py), so
+every stage encodes with the same settings and thread sizing, and the
+hardware-encoder probe runs once per process.
+
+HWACCEL_ARGS go before each decoded `-i`: NVDEC/QSV/VAAPI/VideoToolbox
+decode when a device is there, silent fallback to software when not. Frames
+are downloaded for the CPU filters, so no graph changes are needed.
+"""
+import sys
+from pathlib import Path
+
+try:
+    from adapters._ffmpeg import h264_args, hw_h264_args, threads_args, usable_cores
+except ImportError:  # run as a script: put the repo root on sys.path
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from adapters._ffmpeg import h264_args, hw_h264_args, threads_args, usable_cores
+
+HWACCEL_ARGS = ["-hwaccel", "auto"]
+# visuals.mp4 and its parts are re-encoded by build_video: spend no effort on compression
+X264_INTERMEDIATE_ARGS = ["-c:v", "libx264", "-pix_fmt", "yuv420p", "-preset", "ultrafast",
+                          "-tune", "fastdecode", "-crf", "18"]
+
+def intermediate_h264_args() -> list:
+    """For throwaway encodes: hardware if present, else ultrafast/fastdecode x264 at crf 18."""
+    return list(hw_h264_args() or X264_INTERMEDIATE_ARGS)
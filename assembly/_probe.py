@@ -0,0 +1,113 @@
+# assembly/_probe.py
+"""
+Cached ffprobe results for the assembly scripts.
+
+voice.wav / visuals.mp4 / stock clips get probed by several steps of the same
+run; each ffprobe is a fork+exec plus demuxer init. probe() asks once for
+everything the scripts use (format duration + first video stream geometry,
+codec, pix_fmt, frame rate, profile/level/B-frames) and keeps the parsed
+dict in a small JSON file next to the media (e.g. assets/.probe_cache.json),
+keyed by path and validated against (st_mtime_ns, st_size), so a rewritten
+file is re-probed.
+duration() and video_info() are views on that one record. A step that just
+wrote a file and knows its shape can remember() it, so later steps don't
+probe it at all. New records only mark their cache file dirty; each dirty
+file is written once, by flush() at process exit (or earlier if a caller
+asks), instead of being rewritten on every miss.
+"""
+import atexit, json, os, subprocess, threading
+from pathlib import Path
+
+FFPROBE = "ffprobe"
+CACHE_NAME = ".probe_cache.json"
+# profile/level/has_b_frames: clips joined with -c copy must agree on these too
+VIDEO_KEYS = ("width", "height", "r_frame_rate", "codec_name", "pix_fmt",
+              "profile", "level", "has_b_frames")
+FIELDS = ",".join(VIDEO_KEYS)  # stamped on each record; a different key set re-probes
+
+_caches: dict = {}  # cache file → loaded dict, read once per process
+_dirty: set = set()  # cache files with records not yet written
+_lock = threading.Lock()
+
+def _load(cache: Path) -> dict:
+    if cache not in _caches:
+        try:
+            _caches[cache] = json.loads(cache.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            _caches[cache] = {}
+    return _caches[cache]
+
+def _store(cache: Path, data: dict) -> None:
+    tmp = cache.with_name(f"{cache.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps(data, indent=0), encoding="utf-8")
+        os.replace(tmp, cache)
+    except OSError:
+        pass  # cache is best-effort
+
+def _ffprobe(path: Path) -> dict:
+    out = subprocess.check_output([
+        FFPROBE, "-probesize", "32k", "-analyzeduration", "0", "-v", "error",
+        "-show_entries", "format=duration:stream=codec_type," + ",".join(VIDEO_KEYS),
+        "-of", "json",
+        str(path)
+    ], text=True)
+    data = json.loads(out)
+    try:
+        rec = {"duration": float(data.get("format", {}).get("duration", 0.0))}
+    except (TypeError, ValueError):
+        rec = {"duration": 0.0}
+    video = next((s for s in data.get("streams", []) if s.get("codec_type") == "video"), None)
+    if video:
+        rec["video"] = {k: video[k] for k in VIDEO_KEYS if k in video}
+    return rec
+
+def probe(path: Path) -> dict:
+    """{"duration": float, "video": {...}} (no "video" for audio-only files).
+    Raises OSError if the file is missing and CalledProcessError if ffprobe fails."""
+    path = Path(path).resolve()
+    st = path.stat()
+    cache = path.parent / CACHE_NAME
+    key = str(path)
+    with _lock:
+        hit = _load(cache).get(key)
+    if hit and hit.get("mtime_ns") == st.st_mtime_ns and hit.get("size") == st.st_size \
+            and hit.get("fields") == FIELDS and "probe" in hit:
+        return hit["probe"]
+
+    rec = _ffprobe(path)
+    with _lock:
+        data = _load(cache)
+        data[key] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "fields": FIELDS, "probe": rec}
+        _dirty.add(cache)
+    return rec
+
+def remember(path: Path, rec: dict) -> None:
+    """Record what the producer of `path` already knows ({"duration", "video"})."""
+    path = Path(path).resolve()
+    st = path.stat()
+    cache = path.parent / CACHE_NAME
+    with _lock:
+        data = _load(cache)
+        data[str(path)] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "fields": FIELDS, "probe": rec}
+        _dirty.add(cache)
+
+def flush() -> None:
+    """Write every cache file that got new records; runs at exit, safe to call early."""
+    with _lock:
+        for cache in _dirty:
+            _store(cache, _caches[cache])
+        _dirty.clear()
+
+atexit.register(flush)
+
+def duration(path: Path) -> float:
+    """Container duration in seconds; 0.0 if ffprobe reports nothing usable."""
+    return probe(path)["duration"]
+
+def video_info(path: Path) -> dict:
+    """VIDEO_KEYS of the first video stream ({} if none)."""
+    try:
+        return probe(path).get("video", {})
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        return {}
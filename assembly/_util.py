@@ -0,0 +1,18 @@
+# assembly/_util.py
+"""Small helpers shared by the assembly scripts."""
+import sys
+from pathlib import Path
+
+try:
+    from generator._ep import latest_ep
+except ImportError:  # run as a script: put the repo root on sys.path
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from generator._ep import latest_ep
+
+def latest_plan(series_dir: Path) -> Path:
+    """Newest out/<series>/ep_*/plan.json, picked the same way as every other step."""
+    series_dir = Path(series_dir)
+    ep = latest_ep(series_dir.name, series_dir.parent)
+    if ep is None:
+        raise SystemExit(f"No plan.json found in {series_dir}/ep_*/")
+    return ep / "plan.json"
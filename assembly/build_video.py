@@ -1,28 +1,41 @@
 # assembly/build_video.py
-import argparse, json, subprocess, sys, random, tempfile
+import argparse, json, re, subprocess, sys, random, tempfile
 from pathlib import Path
+from _ffmpeg import HWACCEL_ARGS, h264_args
+from _probe import duration as ffprobe_duration, remember
+from _util import latest_plan
 
 FFMPEG = "ffmpeg"
-FFPROBE = "ffprobe"
 
-def sh(cmd):
+STATS_TIME = re.compile(r"time=(\d+):(\d+):(\d+(?:\.\d+)?)")
+# first video stream of the output header, e.g.
+#   Stream #0:0: Video: h264 (avc1 / 0x31637661), yuv420p(progressive), 1080x1920 [SAR 1:1 DAR 9:16], ...
+OUTPUT_VIDEO = re.compile(r"^Output #0.*?^\s*Stream #0:\d+\S*: Video: (\w+)[^\n]*?\b(\d{2,5})x(\d{2,5})\b",
+                          re.M | re.S)
+
+def sh(cmd) -> str:
     print("+", " ".join(cmd))
     p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
     print(p.stdout)
     if p.returncode != 0:
         raise SystemExit(p.returncode)
+    return p.stdout
 
-def ffprobe_duration(path: Path) -> float:
-    out = subprocess.check_output([
-        FFPROBE, "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "default=noprint_wrappers=1:nokey=1",
-        str(path)
-    ], text=True).strip()
-    try:
-        return float(out)
-    except Exception:
+def encoded_seconds(log: str) -> float:
+    """Output duration from the last `time=` in ffmpeg's progress stats (0.0 if none)."""
+    hits = STATS_TIME.findall(log)
+    if not hits:
         return 0.0
+    h, m, s = hits[-1]
+    return int(h) * 3600 + int(m) * 60 + float(s)
+
+def encoded_video(log: str) -> dict:
+    """codec_name/width/height of the output's video stream as ffmpeg reported it ({} if not found)."""
+    m = OUTPUT_VIDEO.search(log)
+    if not m:
+        return {}
+    codec, w, h = m.groups()
+    return {"width": int(w), "height": int(h), "codec_name": codec}
 
 def main():
     ap = argparse.ArgumentParser()
@@ -30,7 +43,7 @@ def main():
     args = ap.parse_args()
 
     series_dir = Path("out") / args.series
-    plan_path = sorted(series_dir.glob("ep_*/plan.json"))[-1]
+    plan_path = latest_plan(series_dir)
     ep_dir = plan_path.parent
     assets = ep_dir / "assets"
     final_dir = series_dir / "final"
@@ -51,11 +64,13 @@ def main():
 
     # Choose visual input: visuals.mp4 > bg.mp4 > plain color
     if visuals.exists():
-        v_input = str(visuals)
+        v_input = ["-i", str(visuals)]
     elif bg.exists():
-        v_input = str(bg)
+        v_input = ["-i", str(bg)]
     else:
-        v_input = "lavfi:color=size=1080x1920:rate=30:color=black"
+        v_input = ["-f", "lavfi", "-i", "color=size=1080x1920:rate=30:color=black"]
+    if v_input[0] == "-i":
+        v_input = [*HWACCEL_ARGS, *v_input]  # decoded on the GPU when one is there
     
     # … after you define paths like:
     visuals = assets / "visuals.mp4"
@@ -72,7 +87,6 @@ def main():
     music_glob = list(music_dir.glob("*.mp3")) + list(music_dir.glob("*.wav"))
     music = random.choice(music_glob) if music_glob else None
 
-    tmp_mp4 = final_dir / f"{ep_dir.name}.nosubs.mp4"
     out_mp4 = final_dir / f"{ep_dir.name}.mp4"
 
     # Write drawtext via textfile to avoid escaping issues
@@ -84,12 +98,17 @@ def main():
         overlay_file.write_text(overlay, encoding="utf-8")
 
         draw = (
-            "format=yuv420p,scale=1080:1920,"
+            "scale=1080:1920,"
             "drawtext=fontfile=/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf:"
             f"textfile='{title_file}':fontcolor=white:fontsize=64:x=(w-text_w)/2:y=120,"
             "drawtext=fontfile=/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf:"
             f"textfile='{overlay_file}':fontcolor=white:fontsize=48:x=(w-text_w)/2:y=h-300"
         )
+        if srt.exists():
+            # Burn subtitles in the same graph so the picture is encoded once
+            draw += f",subtitles=filename='{srt}'"
+        # Convert to the output pixel format once, after all the text is drawn
+        draw += ",format=yuv420p"
 
         if music:
             # Inputs: 0=v (visuals/bg), 1=voice (mono), 2=music
@@ -100,48 +119,35 @@ def main():
                 f"ratio=8:attack=5:release=200:makeup=1:scn=1[a_mduck];"
                 f"[a_voice][a_mduck]amix=inputs=2:duration=first:dropout_transition=0,volume=1.0[aout]"
             )
-            inputs = ["-i", v_input, "-i", str(voice), "-i", str(music)]
+            inputs = [*v_input, "-i", str(voice), "-i", str(music)]
         else:
             # Inputs: 0=v (visuals/bg), 1=voice (mono)
             filter_complex = (
                 f"[0:v]{draw}[vbg];"
                 f"[1:a]aresample=48000,pan=stereo|c0=c0|c1=c0[aout]"
             )
-            inputs = ["-i", v_input, "-i", str(voice)]
+            inputs = [*v_input, "-i", str(voice)]
 
-        # 1) Compose picture+audio (no subs yet)
-        cmd1 = [
+        # Compose picture (+subs) and audio in a single encode
+        cmd = [
             FFMPEG, "-y",
             *inputs,
             "-t", f"{dur:.3f}",
             "-filter_complex", filter_complex,
             "-map", "[vbg]", "-map", "[aout]",
-            "-c:v", "libx264", "-pix_fmt", "yuv420p", "-preset", "veryfast",
-            "-profile:v", "baseline", "-level", "4.0",
+            *h264_args(),
             "-c:a", "aac", "-b:a", "128k",
             "-movflags", "+faststart",
-            str(tmp_mp4)
+            str(out_mp4)
         ]
-        sh(cmd1)
-
-        # 2) Burn subtitles if present (separate pass keeps filter graphs simple)
-        if srt.exists():
-            cmd2 = [
-                FFMPEG, "-y",
-                "-i", str(tmp_mp4),
-                "-vf", f"subtitles={srt}",
-                "-c:v", "libx264", "-pix_fmt", "yuv420p", "-preset", "veryfast",
-                "-c:a", "copy",
-                "-movflags", "+faststart",
-                str(out_mp4)
-            ]
-            sh(cmd2)
-            try:
-                tmp_mp4.unlink()
-            except FileNotFoundError:
-                pass
-        else:
-            out_mp4 = tmp_mp4
+        log = sh(cmd)
+
+        # ffmpeg already reported what it wrote: seed the probe cache from its
+        # output header and stats so validate_video doesn't reopen the file.
+        # If either can't be parsed, validate_video falls back to ffprobe.
+        out_dur, out_video = encoded_seconds(log), encoded_video(log)
+        if out_dur > 0 and out_video:
+            remember(out_mp4, {"duration": out_dur, "video": out_video})
 
         # Save path in plan
         plan = json.loads(plan_path.read_text(encoding="utf-8"))
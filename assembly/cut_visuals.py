@@ -1,42 +1,137 @@
 # assembly/cut_visuals.py
-import argparse, subprocess, shlex, json
+import argparse, subprocess, json, sys, tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+try:
+    from adapters import _clip_cache
+except ImportError:  # run as a script: put the repo root on sys.path
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from adapters import _clip_cache
+from _ffmpeg import HWACCEL_ARGS, intermediate_h264_args, threads_args, usable_cores
+from _probe import duration as probe_duration, video_info
+from _util import latest_plan
 
 FFMPEG = "ffmpeg"
-FFPROBE = "ffprobe"
+# What every visuals.mp4 part must look like to be concatenated with -c copy
+CONFORM = {"width": 1080, "height": 1920, "r_frame_rate": "30/1",
+           "codec_name": "h264", "pix_fmt": "yuv420p"}
+# ...and what the parts must share with each other: the mp4 keeps only the
+# first part's avcC, so differing profile/level/B-frame setups corrupt the rest
+SHARED = ("profile", "level", "has_b_frames")
+NORMALIZE_VF = ("scale=1080:1920:force_original_aspect_ratio=decrease,"
+                "pad=1080:1920:(ow-iw)/2:(oh-ih)/2:black,format=yuv420p")
 
 def dur_seconds(path: Path) -> float:
     if not path.exists():
         return 0.0
-    cmd = f'{FFPROBE} -v error -show_entries format=duration -of default=nk=1:nw=1 {shlex.quote(str(path))}'
-    out = subprocess.check_output(cmd, shell=True, text=True).strip()
-    try:
-        return float(out)
-    except:
-        return 0.0
+    return probe_duration(path)
 
-def ff_concat(paths, out_path: Path):
+def ff_concat(paths, out_path: Path, seconds: float = 0.0):
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    # Build concat filter with safe re-encode (uniform yuv420p)
-    inputs = " ".join(f'-i {shlex.quote(str(p))}' for p in paths)
-    filters = "".join(f'[{i}:v]scale=1080:1920:force_original_aspect_ratio=decrease,'
-                      f'pad=1080:1920:(ow-iw)/2:(oh-ih)/2:black,format=yuv420p[v{i}];'
-                      for i in range(len(paths)))
-    concat = "".join(f'[v{i}]' for i in range(len(paths))) + f'concat=n={len(paths)}:v=1:a=0[outv]'
-    cmd = f'{FFMPEG} -y {inputs} -filter_complex "{filters}{concat}" -map "[outv]" -r 30 -c:v libx264 -preset veryfast -pix_fmt yuv420p {shlex.quote(str(out_path))}'
-    run = subprocess.run(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    # One graph: per-input normalize (same chain as ff_normalize) → concat → one encode
+    inputs = [arg for p in paths for arg in (*HWACCEL_ARGS, "-i", str(p))]
+    n = len(paths)
+    parts = [f'[{i}:v]{NORMALIZE_VF},fps=30,setsar=1[v{i}];' for i in range(n)]
+    parts += [f'[v{i}]' for i in range(n)]
+    parts.append(f'concat=n={n}:v=1:a=0[outv]')
+    graph = "".join(parts)  # built once, no intermediate strings
+    # seconds > 0: cut to length in the same encode (no separate trim pass)
+    limit = ["-t", f"{seconds:.3f}"] if seconds > 0 else []
+    cmd = [FFMPEG, "-y", *inputs, "-filter_complex", graph, "-map", "[outv]", *limit,
+           "-r", "30", *intermediate_h264_args(), "-an", "-movflags", "+faststart", str(out_path)]
+    run = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
     print(run.stdout)
     if run.returncode != 0:
         raise SystemExit("[cut_visuals] concat failed")
 
+def conforms(path: Path) -> bool:
+    info = video_info(path)
+    return all(info.get(k) == v for k, v in CONFORM.items())
+
+def copy_joinable(paths) -> bool:
+    """Every clip matches CONFORM and they all agree on SHARED (all known)."""
+    if not all(conforms(p) for p in paths):
+        return False
+    shared = {tuple(video_info(p).get(k) for k in SHARED) for p in paths}
+    return len(shared) == 1 and None not in next(iter(shared))
+
+NORMALIZE_WORKERS = max(1, usable_cores() // 2)
+
+def ff_normalize(in_path: Path, out_path: Path) -> Path:
+    """Re-encode one clip to CONFORM; repeat runs on the same clip hit the clip cache."""
+    enc = intermediate_h264_args()
+    key = _clip_cache.key(in_path, NORMALIZE_VF, "r30", *enc)
+    if _clip_cache.fetch(key, out_path):
+        return out_path
+    cmd = [FFMPEG, "-y", "-v", "error", *HWACCEL_ARGS, "-i", str(in_path), "-vf", NORMALIZE_VF,
+           "-r", "30", *enc, *threads_args(NORMALIZE_WORKERS), "-an", str(out_path)]
+    subprocess.run(cmd, check=True)
+    _clip_cache.store(key, out_path)
+    return out_path
+
+def ff_concat_copy(paths, out_path: Path, seconds: float) -> bool:
+    """Concat demuxer + stream copy; all parts must already match CONFORM and each other."""
+    with tempfile.NamedTemporaryFile("w", delete=False, encoding="utf-8", suffix=".txt") as f:
+        for p in paths:
+            q = str(Path(p).absolute()).replace("'", "'\\''")
+            f.write(f"file '{q}'\n")
+        lst = Path(f.name)
+    try:
+        cmd = [FFMPEG, "-y", "-f", "concat", "-safe", "0", "-i", str(lst),
+               "-map", "0:v:0", "-c", "copy", "-t", f"{seconds:.3f}", "-an",
+               "-movflags", "+faststart", str(out_path)]
+        run = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        print(run.stdout)
+        return run.returncode == 0
+    finally:
+        lst.unlink(missing_ok=True)
+
+def build_from_stock(picks, out_path: Path, seconds: float):
+    """
+    Clips that all match CONFORM and share one profile/level/B-frame setup are
+    joined untouched with a stream copy. Otherwise every clip is re-encoded
+    (in parallel, clip-cached) with the same intermediate args, so the parts
+    agree with each other, and those are copy-joined. If no clip conforms, or
+    the copy join fails, everything goes through the single filter_complex
+    encode instead (no intermediate files).
+    """
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    if copy_joinable(picks):
+        print(f"[cut_visuals] all {len(picks)} clip(s) conform; stream-copy join")
+        if not ff_concat_copy(picks, out_path, seconds):
+            print("[cut_visuals] stream-copy concat failed; re-encoding")
+            ff_concat(picks, out_path, seconds)
+        return
+    if not any(conforms(p) for p in picks):
+        # Nothing can be copied: normalize + join + trim in one graph, one encode
+        print(f"[cut_visuals] no clip conforms; single-pass encode of {len(picks)} clip(s)")
+        ff_concat(picks, out_path, seconds)
+        return
+    with tempfile.TemporaryDirectory() as td:
+        # a mixed set: normalize all of it, never join a stock clip with our parts
+        try:
+            with ThreadPoolExecutor(max_workers=NORMALIZE_WORKERS) as ex:
+                parts = list(ex.map(lambda ip: ff_normalize(ip[1], Path(td) / f"norm_{ip[0]:03d}.mp4"),
+                                    enumerate(picks)))
+        except subprocess.CalledProcessError as e:
+            print(f"[cut_visuals] normalize failed (exit {e.returncode}); re-encoding in one pass")
+            ff_concat(picks, out_path, seconds)
+            return
+        print(f"[cut_visuals] mixed stream parameters; normalized all {len(picks)} clip(s)")
+        if not ff_concat_copy(parts, out_path, seconds):
+            print("[cut_visuals] stream-copy concat failed; re-encoding")
+            ff_concat(picks, out_path, seconds)
+
 def ff_trim(in_path: Path, out_path: Path, seconds: float):
-    cmd = f'{FFMPEG} -y -i {shlex.quote(str(in_path))} -t {seconds:.3f} -c copy {shlex.quote(str(out_path))}'
-    run = subprocess.run(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    cmd = [FFMPEG, "-y", "-i", str(in_path), "-t", f"{seconds:.3f}", "-c", "copy",
+           "-movflags", "+faststart", str(out_path)]
+    run = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
     print(run.stdout)
     if run.returncode != 0:
         # fallback re-encode if stream copy can’t cut cleanly
-        cmd2 = f'{FFMPEG} -y -i {shlex.quote(str(in_path))} -t {seconds:.3f} -c:v libx264 -preset veryfast -pix_fmt yuv420p {shlex.quote(str(out_path))}'
-        run2 = subprocess.run(cmd2, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        cmd2 = [FFMPEG, "-y", *HWACCEL_ARGS, "-i", str(in_path), "-t", f"{seconds:.3f}", *intermediate_h264_args(),
+                "-movflags", "+faststart", str(out_path)]
+        run2 = subprocess.run(cmd2, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
         print(run2.stdout)
         if run2.returncode != 0:
             raise SystemExit("[cut_visuals] trim failed")
@@ -47,7 +142,7 @@ def main():
     args = ap.parse_args()
 
     series_dir = Path("out") / args.series
-    plan = sorted(series_dir.glob("ep_*/plan.json"))[-1]
+    plan = latest_plan(series_dir)
     ep_dir = plan.parent
     assets = ep_dir / "assets"
 
@@ -72,7 +167,8 @@ def main():
     stock_list = assets / "stock_list.txt"
     picks = []
     if stock_list.exists():
-        picks = [Path(line.strip()) for line in stock_list.read_text(encoding="utf-8").splitlines() if line.strip()]
+        with stock_list.open("r", encoding="utf-8") as f:
+            picks = [Path(s) for s in (line.strip() for line in f) if s]
     if not picks:
         # scan assets for fetched stock
         picks = sorted(assets.glob(f"{args.series}_pexels_*.mp4")) + sorted(assets.glob(f"{args.series}_pixabay_*.mp4"))
@@ -81,12 +177,8 @@ def main():
         raise SystemExit("[cut_visuals] no router visuals and no stock; nothing to do.")
 
     print("[cut_visuals] building visuals from stock picks:", *[str(p) for p in picks], sep="\n  - ")
-    ff_concat(picks, visuals)
-
-    # trim to narration
-    tmp = visuals.with_suffix(".trim.mp4")
-    ff_trim(visuals, tmp, target)
-    tmp.replace(visuals)
+    # concat + trim to narration, without re-encoding when the clips allow it
+    build_from_stock(picks, visuals, target)
     print("[cut_visuals] done (stock fallback).")
 
 if __name__ == "__main__":
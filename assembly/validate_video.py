@@ -1,41 +1,18 @@
 # assembly/validate_video.py
-import argparse, subprocess, sys, json
+import argparse, sys
 from pathlib import Path
+from _probe import probe
 
-FFPROBE = "ffprobe"
-
-def ffprobe_stream_info(path: Path):
-    """Return (width, height, vcodec) for the first video stream."""
-    cmd = [
-        FFPROBE, "-v", "error",
-        "-select_streams", "v:0",
-        "-show_entries", "stream=width,height,codec_name",
-        "-of", "json",
-        str(path)
-    ]
-    out = subprocess.check_output(cmd, text=True)
-    data = json.loads(out)
-    streams = data.get("streams", [])
-    if not streams:
+def ffprobe_info(path: Path):
+    """Return (width, height, vcodec, duration); one (cached) ffprobe."""
+    info = probe(path)
+    v = info.get("video")
+    if not v:
         raise SystemExit(f"No video stream found in {path}")
-    s0 = streams[0]
-    w = int(s0.get("width", 0))
-    h = int(s0.get("height", 0))
-    vcodec = s0.get("codec_name", "")
-    return w, h, vcodec
-
-def ffprobe_duration(path: Path) -> float:
-    """Return container duration in seconds (float)."""
-    cmd = [
-        FFPROBE, "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "json",
-        str(path)
-    ]
-    out = subprocess.check_output(cmd, text=True)
-    data = json.loads(out)
-    dur = float(data.get("format", {}).get("duration", 0.0))
-    return dur
+    w = int(v.get("width", 0))
+    h = int(v.get("height", 0))
+    vcodec = v.get("codec_name", "")
+    return w, h, vcodec, info["duration"]
 
 def main():
     ap = argparse.ArgumentParser()
@@ -48,8 +25,7 @@ def main():
         raise SystemExit(f"No final mp4 in {final_dir}")
 
     vid = mp4s[-1]
-    w, h, vcodec = ffprobe_stream_info(vid)
-    dur = ffprobe_duration(vid)
+    w, h, vcodec, dur = ffprobe_info(vid)
 
     problems = []
     # Size/aspect: 1080x1920 (9:16) for Reels/TikTok
@@ -1,7 +1,28 @@
 # curriculum/extract_unit.py
-import argparse, json, os, re
+import argparse, json, os, re, sys
 from pathlib import Path
 
+try:
+    from generator._ep import latest_ep
+except ImportError:  # run as a script: put the repo root on sys.path
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from generator._ep import latest_ep
+
+try:  # PyYAML, with the LibYAML C loader when it was built in
+    import yaml
+    try:
+        from yaml import CSafeLoader as _YamlLoader
+    except ImportError:
+        from yaml import SafeLoader as _YamlLoader
+except ImportError:
+    yaml = None
+
+# Fallback manifest parser patterns (used only without PyYAML)
+_COMMENT_RE = re.compile(r"^\s*#")
+_SECTION_RE = re.compile(r"^([a-zA-Z0-9_]+):\s*$")
+_ITEM_RE = re.compile(r"^\s*-\s*(.*)$")
+_KEY_SPLIT_RE = re.compile(r"\s+(?=[a-zA-Z0-9_]+\s*:)")
+
 def read_json(p: Path, default):
     try:
         return json.loads(p.read_text(encoding="utf-8"))
@@ -10,10 +31,8 @@ def read_json(p: Path, default):
 
 def ensure_episode_dirs(series: str):
     series_dir = Path("out") / series
-    eps = sorted(series_dir.glob("ep_*/plan.json"))
-    if eps:
-        ep_dir = eps[-1].parent
-    else:
+    ep_dir = latest_ep(series)
+    if ep_dir is None:
         ep_dir = series_dir / "ep_001"
         (ep_dir / "assets").mkdir(parents=True, exist_ok=True)
         # minimal plan so later steps don’t choke
@@ -42,46 +61,30 @@ def make_placeholder(series: str, ep_dir: Path):
     (assets / "curriculum.txt").write_text(content, encoding="utf-8")
     print(f"[curriculum] wrote placeholder curriculum.txt for {series}")
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--series", required=True)
-    args = ap.parse_args()
-    series = args.series
-
-    ep_dir = ensure_episode_dirs(series)
-    assets = ep_dir / "assets"
-
-    # Read manifest + progress (if exist)
-    manifest = Path("curriculum") / "manifest.yaml"
-    progress_p = Path("progress") / f"{series}.json"
-    if not progress_p.exists():
-        progress_p.parent.mkdir(parents=True, exist_ok=True)
-        progress_p.write_text(json.dumps({"next_index": 0}, indent=2), encoding="utf-8")
-
-    # Very light YAML parser for our simple structure (no PyYAML dependency)
+def _parse_manifest_light(text: str) -> dict:
+    # Very light YAML parser for our simple structure (no PyYAML available)
     # Expected shape:
     # ai_teacher:
     #   - book: linear_algebra.pdf
     #     pages: 1-12
     #     title: Vectors & Geometry
-    text = manifest.read_text(encoding="utf-8") if manifest.exists() else ""
     blocks = {}
     current = None
     for line in text.splitlines():
-        if re.match(r"^\s*#", line):  # comment
+        if _COMMENT_RE.match(line):  # comment
             continue
-        m = re.match(r"^([a-zA-Z0-9_]+):\s*$", line)
+        m = _SECTION_RE.match(line)
         if m:
             current = m.group(1)
             blocks[current] = []
             continue
-        m = re.match(r"^\s*-\s*(.*)$", line)
+        m = _ITEM_RE.match(line)
         if current and m:
             # collect yaml-ish item lines until next dash/section
             item_line = m.group(1).strip()
             # simple key: value; key: value parser
             item = {}
-            parts = [p.strip() for p in re.split(r"\s+(?=[a-zA-Z0-9_]+\s*:)", item_line)]
+            parts = [p.strip() for p in _KEY_SPLIT_RE.split(item_line)]
             # also support single key:value on first line
             parts = [item_line] if not parts else parts
             for p in parts:
@@ -90,6 +93,35 @@ def main():
                     k, v = kv[0].strip(), kv[1].strip().strip('"').strip("'")
                     item[k] = v
             blocks[current].append(item)
+    return blocks
+
+def parse_manifest(text: str) -> dict:
+    """{series: [ {book, pages, title, ...}, ... ]}"""
+    if yaml is None:
+        return _parse_manifest_light(text)
+    data = yaml.load(text, Loader=_YamlLoader) or {}
+    if not isinstance(data, dict):
+        return {}
+    return {k: [it for it in (v or []) if isinstance(it, dict)] for k, v in data.items()}
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--series", required=True)
+    args = ap.parse_args()
+    series = args.series
+
+    ep_dir = ensure_episode_dirs(series)
+    assets = ep_dir / "assets"
+
+    # Read manifest + progress (if exist)
+    manifest = Path("curriculum") / "manifest.yaml"
+    progress_p = Path("progress") / f"{series}.json"
+    if not progress_p.exists():
+        progress_p.parent.mkdir(parents=True, exist_ok=True)
+        progress_p.write_text(json.dumps({"next_index": 0}, indent=2), encoding="utf-8")
+
+    text = manifest.read_text(encoding="utf-8") if manifest.exists() else ""
+    blocks = parse_manifest(text)
 
     series_items = blocks.get(series, [])
     prog = read_json(progress_p, {"next_index": 0})
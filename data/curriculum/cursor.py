@@ -11,14 +11,19 @@ SCHEMA EXAMPLE
 
 USAGE
   from curriculum.cursor import get_cursor, set_cursor, advance_after_success
+
+read_all() keeps the parsed file in memory keyed by its mtime, so repeated
+get/set calls don't re-read it; write_all() replaces the file atomically.
 """
-import json
+import copy, json, os
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 ROOT = Path(__file__).resolve().parents[1]
 CURSOR_PATH = ROOT / "data" / "cursor.json"
 
+_CACHE: Dict[Path, Tuple[int, Dict]] = {}  # path → (st_mtime_ns, parsed)
+
 def _init_if_missing() -> None:
     if not CURSOR_PATH.exists():
         CURSOR_PATH.parent.mkdir(parents=True, exist_ok=True)
@@ -30,10 +35,17 @@ def _init_if_missing() -> None:
 
 def read_all() -> Dict:
     _init_if_missing()
-    return json.loads(CURSOR_PATH.read_text(encoding="utf-8"))
+    mtime = CURSOR_PATH.stat().st_mtime_ns
+    hit = _CACHE.get(CURSOR_PATH)
+    if not hit or hit[0] != mtime:
+        hit = _CACHE[CURSOR_PATH] = (mtime, json.loads(CURSOR_PATH.read_text(encoding="utf-8")))
+    return copy.deepcopy(hit[1])  # callers mutate what they get back
 
 def write_all(data: Dict) -> None:
-    CURSOR_PATH.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    tmp = CURSOR_PATH.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    os.replace(tmp, CURSOR_PATH)
+    _CACHE.pop(CURSOR_PATH, None)
 
 def get_cursor(series: str) -> Dict:
     return read_all().get(series, {})
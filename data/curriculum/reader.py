@@ -13,14 +13,21 @@ from typing import Dict, Optional, Tuple
 ROOT = Path(__file__).resolve().parents[1]
 CURR = ROOT / "data" / "curriculum"
 
+_INDEX_CACHE: Dict[Path, Tuple[int, Dict]] = {}  # chapter_index.json → (st_mtime_ns, parsed)
+
 def _chapter_dir(book_slug: str, chapter: int) -> Path:
     return CURR / book_slug / f"ch{chapter:02d}"
 
 def _load_chapter_index(book_slug: str, chapter: int) -> Dict:
     p = _chapter_dir(book_slug, chapter) / "chapter_index.json"
-    if not p.exists():
-        raise FileNotFoundError(f"Missing chapter index: {p}")
-    return json.loads(p.read_text(encoding="utf-8"))
+    try:
+        mtime = p.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Missing chapter index: {p}") from None
+    hit = _INDEX_CACHE.get(p)
+    if not hit or hit[0] != mtime:
+        hit = _INDEX_CACHE[p] = (mtime, json.loads(p.read_text(encoding="utf-8")))
+    return hit[1]
 
 def pick_next_chunk(book_slug: str, chapter: int, section: str, part: int) -> Tuple[Path, str, int]:
     """
@@ -0,0 +1,23 @@
+# generator/_ep.py
+"""Latest-episode lookup shared by every pipeline script (generator, planner,
+assembly, publisher, curriculum), so they all agree on which ep_* is newest."""
+import os
+from pathlib import Path
+
+def _ep_key(name: str):
+    # ep_<unix stamp> from the planner, ep_001 from the curriculum placeholder
+    suffix = name.split("_", 1)[-1]
+    return (int(suffix) if suffix.isdigit() else -1, name)
+
+def latest_ep(series: str, out: Path = Path("out")) -> Path | None:
+    """Newest <out>/<series>/ep_* that has a plan.json: one scandir, no sort. None if there is none."""
+    try:
+        with os.scandir(Path(out) / series) as it:
+            eps = [e.name for e in it
+                   if e.name.startswith("ep_") and e.is_dir()
+                   and os.path.isfile(os.path.join(e.path, "plan.json"))]
+    except FileNotFoundError:
+        return None
+    if not eps:
+        return None
+    return Path(out) / series / max(eps, key=_ep_key)
@@ -0,0 +1,44 @@
+# generator/_media.py
+"""Media-length helpers shared by the generator scripts."""
+import os
+import subprocess
+import wave
+from functools import lru_cache
+from pathlib import Path
+
+FFPROBE = "ffprobe"
+
+@lru_cache(maxsize=512)
+def _ffprobe_duration(path: str, mtime_ns: int, size: int) -> float:
+    # (mtime_ns, size) are only part of the key: a rewritten file is probed again
+    out = subprocess.check_output([
+        FFPROBE, "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        path
+    ], text=True).strip()
+    try:
+        return float(out)
+    except Exception:
+        return 0.0
+
+def ffprobe_duration(path: Path) -> float:
+    st = os.stat(path)
+    return _ffprobe_duration(os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+def wav_duration(path: Path) -> float | None:
+    """Length from the WAV header, no subprocess. None if it isn't a plain PCM WAV or the
+    header carries a streaming placeholder size (more frames than the file can hold)."""
+    try:
+        with wave.open(str(path), "rb") as w:
+            frames, rate = w.getnframes(), w.getframerate()
+            frame_bytes = w.getsampwidth() * w.getnchannels()
+    except (wave.Error, EOFError, OSError):
+        return None
+    if not rate or frames * frame_bytes > Path(path).stat().st_size:
+        return None
+    return frames / rate
+
+def media_duration(path: Path) -> float:
+    d = wav_duration(path) if Path(path).suffix.lower() == ".wav" else None
+    return d if d is not None else ffprobe_duration(path)
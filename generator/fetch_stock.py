@@ -1,7 +1,18 @@
 # generator/fetch_stock.py
-import argparse, os, json, random, re, sys, time
+import argparse, os, json, random, re, shutil, sys, time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from _ep import latest_ep
+
+# One keep-alive pool for every search + download (no TCP/TLS setup per URL)
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16,
+                                      max_retries=Retry(total=3, backoff_factor=0.5)))
+DOWNLOAD_WORKERS = 8
 
 # --- Simple keyword presets per series ---
 KEYWORDS = {
@@ -13,8 +24,10 @@ KEYWORDS = {
 def ensure_dir(p: Path):
     p.mkdir(parents=True, exist_ok=True)
 
+_UNSAFE_RE = re.compile(r"[^a-zA-Z0-9._-]+")
+
 def sanitize(name: str) -> str:
-    return re.sub(r"[^a-zA-Z0-9._-]+", "_", name)[:80]
+    return _UNSAFE_RE.sub("_", name)[:80]
 
 def pick_keywords(series: str, k: int = 3):
     base = KEYWORDS.get(series, KEYWORDS["ai_memes"])
@@ -26,7 +39,7 @@ def pexels_search(api_key: str, query: str, per_page=10):
     url = "https://api.pexels.com/videos/search"
     headers = {"Authorization": api_key}
     params = {"query": query, "per_page": per_page}
-    r = requests.get(url, headers=headers, params=params, timeout=30)
+    r = SESSION.get(url, headers=headers, params=params, timeout=30)
     r.raise_for_status()
     return r.json()
 
@@ -39,15 +52,14 @@ def best_pexels_mp4(video_obj: dict):
         vert = 1 if h >= w else 0
         ok = 1 if w <= 1080 else 0
         return (vert, ok, -abs((h or 0) - 1920), -abs((w or 0) - 1080))
-    if not files: return None
-    files.sort(key=score, reverse=True)
-    return files[0].get("link")
+    best = max(files, key=score, default=None)
+    return best.get("link") if best else None
 
 # -------- Pixabay ----------
 def pixabay_search(api_key: str, query: str, per_page=20):
     url = "https://pixabay.com/api/videos/"
     params = {"key": api_key, "q": query, "per_page": per_page, "safesearch": "true"}
-    r = requests.get(url, params=params, timeout=30)
+    r = SESSION.get(url, params=params, timeout=30)
     r.raise_for_status()
     return r.json()
 
@@ -61,23 +73,94 @@ def best_pixabay_mp4(hit: dict):
         h = v.get("height") or 0
         if url:
             candidates.append((h >= w, w <= 1080, -abs(h-1920), -abs(w-1080), url))
-    if not candidates: return None
-    candidates.sort(reverse=True)
-    return candidates[0][-1]
+    best = max(candidates, default=None)
+    return best[-1] if best else None
 
 # -------- download ----------
 def download(url: str, dest: Path) -> bool:
+    # write to .part and rename, so a failed download never looks like a cached clip
+    part = dest.with_name(dest.name + ".part")
     try:
-        with requests.get(url, stream=True, timeout=120) as r:
+        with SESSION.get(url, stream=True, timeout=120) as r:
             r.raise_for_status()
-            with open(dest, "wb") as f:
-                for chunk in r.iter_content(1024*256):
-                    if chunk: f.write(chunk)
+            r.raw.decode_content = True
+            with open(part, "wb") as f:
+                shutil.copyfileobj(r.raw, f, length=1 << 20)
+        part.replace(dest)
         return True
     except Exception as e:
         print("[fetch] download failed:", url, e)
+        part.unlink(missing_ok=True)
         return False
 
+def candidates(series: str, keywords, lib: Path, pexels_key: str, pixabay_key: str, per_query: int):
+    """(url, dest, source) in preference order: Pexels, then Pixabay. Searches run lazily,
+    so Pixabay is only queried once the Pexels results are used up."""
+    seen = set()
+    if pexels_key:
+        for kw in keywords:
+            try:
+                data = pexels_search(pexels_key, kw, per_page=per_query)
+            except Exception as e:
+                print("[fetch] pexels error:", e)
+                continue
+            for v in data.get("videos", []):
+                mp4 = best_pexels_mp4(v)
+                if not mp4: continue
+                dest = lib / sanitize(f"{series}_pexels_{v.get('id','vid')}.mp4")
+                if dest.exists() or dest in seen:  # already have it
+                    continue
+                seen.add(dest)
+                yield mp4, dest, "pexels"
+
+    if pixabay_key:
+        for kw in keywords:
+            try:
+                data = pixabay_search(pixabay_key, kw, per_page=per_query)
+            except Exception as e:
+                print("[fetch] pixabay error:", e)
+                continue
+            for hit in data.get("hits", []):
+                mp4 = best_pixabay_mp4(hit)
+                if not mp4: continue
+                dest = lib / sanitize(f"{series}_pixabay_{hit.get('id','vid')}.mp4")
+                if dest.exists() or dest in seen:
+                    continue
+                seen.add(dest)
+                yield mp4, dest, "pixabay"
+
+def download_some(cands, want: int) -> list:
+    """Download concurrently until `want` succeed; failed slots go to the next candidate."""
+    downloaded = []
+    it = iter(cands)
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as ex:
+        pending = {}
+        def fill():
+            while len(downloaded) + len(pending) < want and len(pending) < DOWNLOAD_WORKERS:
+                nxt = next(it, None)
+                if nxt is None:
+                    return
+                url, dest, source = nxt
+                pending[ex.submit(download, url, dest)] = (dest, source)
+        fill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                dest, source = pending.pop(fut)
+                if fut.result():
+                    downloaded.append(dest)
+                    print(f"[fetch] {source} ->", dest)
+            fill()
+    return downloaded
+
+def stage(src: Path, tgt: Path) -> None:
+    """Hard-link the library clip into the episode; kernel-side copy if that can't work."""
+    tgt.unlink(missing_ok=True)
+    try:
+        os.link(src, tgt)
+    except OSError:  # EXDEV (other filesystem), EPERM (no hardlinks), ...
+        shutil.copyfile(src, tgt)
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--series", required=True)
@@ -87,12 +170,10 @@ def main():
 
     series = args.series
     # workspace episode dirs (use now)
-    out_dir = Path("out") / series
-    plan_list = sorted(out_dir.glob("ep_*/plan.json"))
-    if not plan_list:
+    ep_dir = latest_ep(series)
+    if ep_dir is None:
         print(f"[fetch] no plan.json yet under out/{series}", file=sys.stderr)
         sys.exit(0)
-    ep_dir = plan_list[-1].parent
     assets = ep_dir / "assets"
     ensure_dir(assets)
 
@@ -109,54 +190,15 @@ def main():
 
     keywords = pick_keywords(series, 3)
     want = args.max_new
-    downloaded = []
-
-    # First try Pexels
-    if pexels_key:
-        for kw in keywords:
-            if len(downloaded) >= want: break
-            try:
-                data = pexels_search(pexels_key, kw, per_page=args.per_query)
-                for v in data.get("videos", []):
-                    if len(downloaded) >= want: break
-                    mp4 = best_pexels_mp4(v)
-                    if not mp4: continue
-                    name = sanitize(f"{series}_pexels_{v.get('id','vid')}.mp4")
-                    dest = local_lib_series / name
-                    if dest.exists():  # already have it
-                        continue
-                    if download(mp4, dest):
-                        downloaded.append(dest)
-                        print("[fetch] pexels ->", dest)
-            except Exception as e:
-                print("[fetch] pexels error:", e)
-
-    # Then try Pixabay if still need more
-    if pixabay_key and len(downloaded) < want:
-        for kw in keywords:
-            if len(downloaded) >= want: break
-            try:
-                data = pixabay_search(pixabay_key, kw, per_page=args.per_query)
-                for hit in data.get("hits", []):
-                    if len(downloaded) >= want: break
-                    mp4 = best_pixabay_mp4(hit)
-                    if not mp4: continue
-                    name = sanitize(f"{series}_pixabay_{hit.get('id','vid')}.mp4")
-                    dest = local_lib_series / name
-                    if dest.exists():
-                        continue
-                    if download(mp4, dest):
-                        downloaded.append(dest)
-                        print("[fetch] pixabay ->", dest)
-            except Exception as e:
-                print("[fetch] pixabay error:", e)
+    downloaded = download_some(
+        candidates(series, keywords, local_lib_series, pexels_key, pixabay_key, args.per_query), want)
 
     # Also stage into the current episode assets for immediate use
     staged = []
     for p in downloaded:
         tgt = assets / p.name
         try:
-            tgt.write_bytes(p.read_bytes())
+            stage(p, tgt)
             staged.append(tgt)
         except Exception as e:
             print("[fetch] stage copy failed:", p, e)
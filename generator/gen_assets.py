@@ -1,34 +1,126 @@
 # generator/gen_assets.py
 import argparse
+import hashlib
 import json
 import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import textwrap
 
-from tts_openai import synthesize
+try:  # orjson when installed; plan.json is small, so stdlib json is a fine fallback
+    import orjson
+except ImportError:
+    orjson = None
+
+from _ep import latest_ep
+from tts_openai import OPENAI_TTS_MODEL, OPENAI_TTS_VOICE, synthesize
+
+FFMPEG = "ffmpeg"
+TTS_CACHE_DIR = Path("out") / ".tts_cache"
+TTS_CHUNK_CHARS = 200   # sentences are grouped up to this many characters per request
+TTS_WORKERS = 8
+_TTS_SLOTS = threading.BoundedSemaphore(TTS_WORKERS)  # in-flight requests, process-wide (see gen_assets_batch.py)
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
 
 def ensure_dir(p: Path):
     p.mkdir(parents=True, exist_ok=True)
 
 def load_plan(series: str) -> tuple[dict, Path]:
-    out_dir = Path("out") / series
     # Pick most recent episode plan.json
-    plan_paths = sorted(out_dir.glob("ep_*/plan.json"))
-    if not plan_paths:
+    ep_dir = latest_ep(series)
+    if ep_dir is None:
         raise SystemExit(f"No plan.json found in out/{series}/ep_*/")
-    plan_path = plan_paths[-1]
-    plan = json.loads(plan_path.read_text(encoding="utf-8"))
+    plan_path = ep_dir / "plan.json"
+    plan = (orjson or json).loads(plan_path.read_bytes())
     return plan, plan_path
 
 def write_text(path: Path, content: str):
     path.write_text(content, encoding="utf-8")
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--series", required=True)
-    args = ap.parse_args()
+def clamp_words(text: str, width: int, placeholder: str = "…") -> str:
+    """Collapse whitespace; if longer than width, cut at a word boundary and append placeholder
+    (same result as textwrap.shorten, without its regex re-tokenizing)."""
+    words = text.split()
+    out = " ".join(words)
+    if len(out) <= width:
+        return out
+    n, keep = 0, []
+    for w in words:
+        n += len(w) + (1 if keep else 0)
+        if n + len(placeholder) > width:
+            break
+        keep.append(w)
+    return " ".join(keep) + placeholder
+
+def split_narration(text: str, limit: int = TTS_CHUNK_CHARS) -> list[str]:
+    """Whole sentences grouped into chunks of at most `limit` chars (a longer sentence stays whole)."""
+    chunks, cur = [], ""
+    for sent in _SENTENCE_END.split(text.strip()):
+        if cur and len(cur) + 1 + len(sent) > limit:
+            chunks.append(cur)
+            cur = sent
+        else:
+            cur = f"{cur} {sent}" if cur else sent
+    if cur:
+        chunks.append(cur)
+    return chunks
+
+def _synthesize_slot(text: str, out_path: Path) -> None:
+    with _TTS_SLOTS:
+        synthesize(text, str(out_path))
+
+def synthesize_chunked(text: str, voice_path: Path) -> None:
+    """
+    TTS the narration as concurrent per-chunk requests, then join the WAVs in
+    order with ffmpeg's concat demuxer (re-muxed to one PCM stream, since the
+    API's WAV headers carry streaming sizes).
+    """
+    chunks = split_narration(text)
+    if len(chunks) <= 1:
+        _synthesize_slot(text, voice_path)
+        return
 
-    series = args.series
+    parts = [voice_path.parent / f"_tts_{i:03d}.wav" for i in range(len(chunks))]
+    try:
+        with ThreadPoolExecutor(max_workers=min(TTS_WORKERS, len(chunks))) as ex:
+            list(ex.map(_synthesize_slot, chunks, parts))
+
+        with tempfile.NamedTemporaryFile("w", delete=False, encoding="utf-8", suffix=".txt") as f:
+            for p in parts:
+                f.write(f"file '{p.absolute()}'\n")
+            lst = Path(f.name)
+        try:
+            subprocess.run([FFMPEG, "-y", "-v", "error", "-f", "concat", "-safe", "0", "-i", str(lst),
+                            "-c:a", "pcm_s16le", str(voice_path)], check=True)
+        finally:
+            lst.unlink(missing_ok=True)
+    finally:
+        for p in parts:
+            p.unlink(missing_ok=True)
+
+def synthesize_cached(text: str, voice_path: Path) -> None:
+    """Reuse the WAV from an earlier run with the same text/voice/model; otherwise synthesize and keep a copy."""
+    key = hashlib.sha256(f"{text}|{OPENAI_TTS_VOICE}|{OPENAI_TTS_MODEL}".encode("utf-8")).hexdigest()
+    cached = TTS_CACHE_DIR / f"{key}.wav"
+    if cached.exists():
+        print(f"[TTS] cache hit {cached.name}")
+        shutil.copyfile(cached, voice_path)
+        return
+
+    synthesize_chunked(text, voice_path)
+    try:
+        ensure_dir(TTS_CACHE_DIR)
+        tmp = cached.with_name(f"{cached.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        shutil.copyfile(voice_path, tmp)
+        os.replace(tmp, cached)
+    except OSError as e:
+        print(f"[TTS] cache write skipped: {e}")
+
+def build_assets(series: str) -> None:
     plan, plan_path = load_plan(series)
 
     # Prefer AI-enriched fields if present (from agent_director), fallback to seed fields
@@ -37,8 +129,7 @@ def main():
     narration = plan.get("ai_narration") or plan.get("narration") or plan.get("script") or "Welcome to today’s episode."
 
     # Normalize narration length for ≈45s (light touch)
-    narration = " ".join(narration.split())
-    narration = textwrap.shorten(narration, width=1200, placeholder="…")
+    narration = clamp_words(narration, 1200)
 
     ep_dir = Path(plan_path).parent
     assets_dir = ep_dir / "assets"
@@ -52,7 +143,7 @@ def main():
     # Generate voice-over with OpenAI TTS → voice.wav
     voice_path = assets_dir / "voice.wav"
     print(f"[TTS] Synthesizing VO to {voice_path} …")
-    synthesize(narration, str(voice_path))
+    synthesize_cached(narration, voice_path)
     print("[TTS] Done.")
 
     # (Optional) placeholder background music selection can be added later
@@ -62,8 +153,17 @@ def main():
     plan["resolved_title"] = title
     plan["resolved_overlay"] = overlay
     plan["resolved_narration"] = narration
-    plan_path.write_text(json.dumps(plan, indent=2), encoding="utf-8")
+    if orjson:
+        plan_path.write_bytes(orjson.dumps(plan, option=orjson.OPT_INDENT_2))
+    else:
+        plan_path.write_text(json.dumps(plan, indent=2), encoding="utf-8")
     print(f"[gen_assets] Wrote assets in {assets_dir}")
 
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--series", required=True)
+    args = ap.parse_args()
+    build_assets(args.series)
+
 if __name__ == "__main__":
     main()
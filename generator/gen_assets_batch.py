@@ -0,0 +1,45 @@
+# generator/gen_assets_batch.py
+"""
+gen_assets.py for several series in one process.
+
+Each series' narration is already split into parallel TTS requests; running
+the series side by side lets one series' requests fill the slots another
+leaves idle, so N series take about as long as the longest one. The total
+number of in-flight TTS requests stays capped at gen_assets.TTS_WORKERS.
+
+  python generator/gen_assets_batch.py                       # every series under out/
+  python generator/gen_assets_batch.py --series math_of_ML MAS
+"""
+import argparse
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from gen_assets import build_assets
+
+def discover_series() -> list[str]:
+    return sorted({p.parent.parent.name for p in Path("out").glob("*/ep_*/plan.json")})
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--series", nargs="*", help="default: every series with a plan under out/")
+    args = ap.parse_args()
+
+    series = args.series or discover_series()
+    if not series:
+        raise SystemExit("No plan.json found under out/*/ep_*/")
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=len(series)) as ex:
+        futs = {s: ex.submit(build_assets, s) for s in series}
+        for s, fut in futs.items():
+            try:
+                fut.result()
+            except (Exception, SystemExit) as e:
+                print(f"[gen_assets_batch] {s} failed: {e}", file=sys.stderr)
+                failed.append(s)
+    if failed:
+        raise SystemExit(f"[gen_assets_batch] failed: {', '.join(failed)}")
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,23 @@
 # generator/gen_background.py
-import argparse, subprocess, sys, os
+import argparse, hashlib, subprocess, sys, os
 from pathlib import Path
 
+from _ep import latest_ep
+from _media import media_duration
+
+try:
+    from adapters._ffmpeg import h264_args
+except ImportError:  # run as a script: put the repo root on sys.path
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from adapters._ffmpeg import h264_args
+
 FFMPEG = "ffmpeg"
-FFPROBE = "ffprobe"
-
-def ffprobe_duration(path: Path) -> float:
-    out = subprocess.check_output([
-        FFPROBE, "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "default=noprint_wrappers=1:nokey=1",
-        str(path)
-    ], text=True).strip()
-    try:
-        return float(out)
-    except Exception:
-        return 0.0
+SIZE = "1080x1920"
+FPS = 30
+# every episode's bg is the same colour, only shorter: encode one long clip per
+# colour/encoder once and stream-copy the head of it
+TEMPLATE_DIR = Path("out") / ".bg_templates"
+TEMPLATE_S = 95
 
 def sh(args):
     print("+", " ".join(args))
@@ -24,38 +26,80 @@ def sh(args):
     if p.returncode != 0:
         sys.exit(p.returncode)
 
+def color_template(color_hex: str, enc: list) -> Path:
+    """TEMPLATE_S seconds of solid colour, encoded on first use."""
+    tag = hashlib.sha1(f"{SIZE}|{FPS}|{' '.join(enc)}".encode("utf-8")).hexdigest()[:10]
+    tpl = TEMPLATE_DIR / f"{color_hex}_{TEMPLATE_S}s_{tag}.mp4"
+    if tpl.exists():
+        return tpl
+    TEMPLATE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = tpl.with_name(f".{tpl.stem}.{os.getpid()}.mp4")
+    sh([
+        FFMPEG, "-y",
+        "-f", "lavfi",
+        "-i", f"color=c={color_hex}:s={SIZE}:r={FPS}",
+        "-t", str(TEMPLATE_S),
+        "-vf", "format=yuv420p",
+        *enc,
+        str(tmp)
+    ])
+    os.replace(tmp, tpl)
+    return tpl
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--series", required=True)
     args = ap.parse_args()
 
-    series_dir = Path("out") / args.series
-    plan_path = sorted(series_dir.glob("ep_*/plan.json"))[-1]
-    ep_dir = plan_path.parent
+    ep_dir = latest_ep(args.series)
+    if ep_dir is None:
+        raise SystemExit(f"No plan.json found in out/{args.series}/ep_*/")
     assets = ep_dir / "assets"
     assets.mkdir(parents=True, exist_ok=True)
 
     voice = assets / "voice.wav"
     if not voice.exists():
         raise SystemExit(f"Missing voice at {voice}")
-    dur = ffprobe_duration(voice)
+    dur = media_duration(voice)
     if dur < 3:
         raise SystemExit(f"Voice too short ({dur:.2f}s)")
 
     bg = assets / "bg.mp4"
+    meta = bg.with_name(bg.name + ".meta")
 
     # Solid, calm background color (override with BG_COLOR like 0x101426)
     color_hex = os.environ.get("BG_COLOR", "0x101426")
     filter_chain = "format=yuv420p"
-    sh([
-        FFMPEG, "-y",
-        "-f", "lavfi",
-        "-i", f"color=c={color_hex}:s=1080x1920:r=30",
-        "-t", f"{dur:.3f}",
-        "-vf", filter_chain,
-        "-c:v", "libx264", "-pix_fmt", "yuv420p", "-preset", "veryfast",
-        str(bg)
-    ])
+    # shared hardware encoder when one works; on libx264 a constant-colour
+    # source lets stillimage tuning skip most of the motion search
+    enc = [*h264_args(tune="stillimage"), "-g", "300", "-movflags", "+faststart"]
+
+    # everything that shapes bg.mp4; a rerun with the same voice length is a no-op
+    sig = f"{color_hex}|{SIZE}|{FPS}|{dur:.3f}|{' '.join(enc)}"
+    if bg.exists() and meta.exists() and meta.read_text(encoding="utf-8") == sig:
+        print(f"[bg] cache hit {bg} ({dur:.2f}s) color={color_hex}")
+        return
+    meta.unlink(missing_ok=True)
+
+    if dur <= TEMPLATE_S:
+        sh([
+            FFMPEG, "-y",
+            "-i", str(color_template(color_hex, enc)),
+            "-t", f"{dur:.3f}",
+            "-c", "copy", "-movflags", "+faststart",
+            str(bg)
+        ])
+    else:
+        sh([
+            FFMPEG, "-y",
+            "-f", "lavfi",
+            "-i", f"color=c={color_hex}:s={SIZE}:r={FPS}",
+            "-t", f"{dur:.3f}",
+            "-vf", filter_chain,
+            *enc,
+            str(bg)
+        ])
+    meta.write_text(sig, encoding="utf-8")
     print(f"[bg] wrote {bg} ({dur:.2f}s) color={color_hex}")
 
 if __name__ == "__main__":
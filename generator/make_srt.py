@@ -1,47 +1,77 @@
 # generator/make_srt.py
 import argparse, os, sys
+from functools import lru_cache
 from pathlib import Path
 
-# Uses OpenAI Whisper to create *timed* SRT directly from voice.wav.
-# Falls back to heuristic SRT if API fails (so CI still completes).
+import numpy as np
 
-def heuristic_srt(narration_path: Path, dur: float) -> str:
-    # simple fallback: ~2.2 WPS, 7 words per line
-    import math
-    def fmt_ts(t):
-        h=int(t//3600); t-=h*3600; m=int(t//60); t-=m*60; s=int(t); ms=int((t-s)*1000)
-        return f"{h:02}:{m:02}:{s:02},{ms:03}"
-    txt = " ".join(narration_path.read_text(encoding="utf-8").split())
-    words = txt.split()
+from _ep import latest_ep
+from _media import media_duration
+
+# Creates *timed* SRT directly from voice.wav: local faster-whisper when it is
+# installed (USE_OPENAI_WHISPER=1 forces the API), else OpenAI Whisper.
+# Falls back to heuristic SRT if both fail (so CI still completes).
+WHISPER_MODEL = os.environ.get("WHISPER_MODEL", "small")
+WHISPER_COMPUTE = os.environ.get("WHISPER_COMPUTE", "int8")  # int8 runs on CPU and CUDA
+
+def _fmt_ts(t: np.ndarray) -> list:
+    ms = (t * 1000).astype(np.int64)
+    s, ms = np.divmod(ms, 1000)
+    m, s = np.divmod(s, 60)
+    h, m = np.divmod(m, 60)
+    return [f"{a:02}:{b:02}:{c:02},{d:03}" for a, b, c, d in zip(h.tolist(), m.tolist(), s.tolist(), ms.tolist())]
+
+def heuristic_srt(narration_path: Path, dur: float, out_path: Path) -> None:
+    # simple fallback: ~2.2 WPS, 7 words per line; cues past the end of the voice are dropped
+    words = narration_path.read_text(encoding="utf-8").split()
     wps = 2.2; chunk = 7
-    srt_lines = []
-    idx=1; t=0.0
-    for i in range(0, len(words), chunk):
-        piece = " ".join(words[i:i+chunk])
-        seg = max(len(piece.split())/wps, 0.8)
-        start=t; end=min(t+seg, max(dur-0.05, t+0.01))
-        if end <= start: break
-        srt_lines.append(f"{idx}\n{fmt_ts(start)} --> {fmt_ts(end)}\n{piece}\n")
-        idx+=1; t=end
-    return "\n".join(srt_lines)
+    pieces = [" ".join(words[i:i+chunk]) for i in range(0, len(words), chunk)]
+    n_words = np.minimum(chunk, len(words) - chunk * np.arange(len(pieces)))
+    seg = np.maximum(n_words / wps, 0.8)
+    cap = max(dur - 0.05, 0.01)
+    ends = np.minimum(np.cumsum(seg), cap)
+    starts = np.concatenate(([0.0], ends))[:-1]
+    keep = ends > starts
+    start_ts, end_ts = _fmt_ts(starts[keep]), _fmt_ts(ends[keep])
+    kept = (p for p, k in zip(pieces, keep.tolist()) if k)
+    with out_path.open("w", encoding="utf-8") as f:
+        f.writelines(f"{i}\n{a} --> {b}\n{p}\n\n"
+                     for i, (a, b, p) in enumerate(zip(start_ts, end_ts, kept), 1))
+
+@lru_cache(maxsize=1)
+def _openai_client(api_key: str):
+    from openai import OpenAI
+    # SDK-level retries, so a transient error doesn't drop us to the heuristic SRT
+    return OpenAI(api_key=api_key, timeout=300.0, max_retries=3)
 
-def ffprobe_duration(path: Path) -> float:
-    import subprocess
-    out = subprocess.check_output([
-        "ffprobe","-v","error","-show_entries","format=duration",
-        "-of","default=noprint_wrappers=1:nokey=1", str(path)
-    ], text=True).strip()
-    try: return float(out)
-    except: return 0.0
+def local_whisper_srt(voice: Path, out_path: Path) -> bool:
+    """Transcribe with faster-whisper (CTranslate2, batched); False if it isn't installed or finds no speech."""
+    try:
+        from faster_whisper import BatchedInferencePipeline, WhisperModel
+    except ImportError:
+        return False
+    model = WhisperModel(WHISPER_MODEL, device="auto", compute_type=WHISPER_COMPUTE)
+    segments, _ = BatchedInferencePipeline(model=model).transcribe(
+        str(voice), batch_size=8, vad_filter=True)
+    segs = [(seg.start, seg.end, seg.text.strip()) for seg in segments]
+    segs = [sg for sg in segs if sg[2]]
+    if not segs:
+        return False
+    start_ts = _fmt_ts(np.array([sg[0] for sg in segs]))
+    end_ts = _fmt_ts(np.array([sg[1] for sg in segs]))
+    with out_path.open("w", encoding="utf-8") as f:
+        f.writelines(f"{i}\n{a} --> {b}\n{sg[2]}\n\n"
+                     for i, (a, b, sg) in enumerate(zip(start_ts, end_ts, segs), 1))
+    return True
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--series", required=True)
     args = ap.parse_args()
 
-    series_dir = Path("out")/args.series
-    plan_path = sorted(series_dir.glob("ep_*/plan.json"))[-1]
-    ep_dir = plan_path.parent
+    ep_dir = latest_ep(args.series)
+    if ep_dir is None:
+        raise SystemExit(f"No plan.json found in out/{args.series}/ep_*/")
     assets = ep_dir/"assets"
     voice = assets/"voice.wav"
     narration_txt = assets/"narration.txt"
@@ -49,21 +79,28 @@ def main():
 
     if not voice.exists():
         raise SystemExit("voice.wav missing")
-    dur = ffprobe_duration(voice)
+
+    if os.environ.get("USE_OPENAI_WHISPER") != "1":
+        try:
+            if local_whisper_srt(voice, srt_path):
+                print(f"[srt] wrote {srt_path} via faster-whisper ({WHISPER_MODEL})")
+                return
+        except Exception as e:
+            sys.stderr.write(f"[srt] faster-whisper failed, falling back. Error: {e}\n")
 
     api_key = os.environ.get("OPENAI_API_KEY")
     if api_key:
         try:
-            from openai import OpenAI
-            client = OpenAI(api_key=api_key)
-            with open(voice, "rb") as f:
-                # Whisper with SRT output (aligned timestamps)
-                srt = client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=f,
-                    response_format="srt",
-                    temperature=0.0,
-                )
+            client = _openai_client(api_key)
+            # read once; SDK retries resend these bytes instead of re-reading the file
+            audio = (voice.name, voice.read_bytes())
+            # Whisper with SRT output (aligned timestamps)
+            srt = client.audio.transcriptions.create(
+                model="whisper-1",
+                file=audio,
+                response_format="srt",
+                temperature=0.0,
+            )
             # Some SDKs return bytes/string under .text; handle both
             srt_text = getattr(srt, "text", None) or str(srt)
             if srt_text.strip():
@@ -75,8 +112,7 @@ def main():
 
     # Fallback heuristic if no API key or Whisper failed
     if narration_txt.exists():
-        srt_text = heuristic_srt(narration_txt, dur)
-        srt_path.write_text(srt_text, encoding="utf-8")
+        heuristic_srt(narration_txt, media_duration(voice), srt_path)
         print(f"[srt] wrote {srt_path} (heuristic)")
     else:
         raise SystemExit("narration.txt missing and Whisper unavailable")
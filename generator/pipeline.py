@@ -0,0 +1,76 @@
+# generator/pipeline.py
+"""
+Per-episode steps between the director and final assembly, run as a DAG.
+
+  gen_assets ─┬─ gen_background
+              ├─ make_srt
+              └─ make_shotlist ── route_shots ── cut_visuals
+
+Only voice.wav / narration.txt are shared inputs, so once gen_assets is done
+the three branches run side by side (each step is its usual script in its own
+process); the critical path is TTS + the slowest branch instead of the sum of
+every step. A failed step stops its dependents; the others still finish.
+
+  python generator/pipeline.py --series math_of_ML
+"""
+import argparse
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# name → (script, prerequisites)
+STAGES = {
+    "gen_assets":     ("generator/gen_assets.py",     ()),
+    "gen_background": ("generator/gen_background.py", ("gen_assets",)),
+    "make_srt":       ("generator/make_srt.py",       ("gen_assets",)),
+    "make_shotlist":  ("planner/make_shotlist.py",    ("gen_assets",)),
+    "route_shots":    ("generator/route_shots.py",    ("make_shotlist",)),
+    "cut_visuals":    ("assembly/cut_visuals.py",     ("route_shots",)),
+}
+
+def run_stage(name: str, series: str) -> int:
+    script, _ = STAGES[name]
+    t0 = time.monotonic()
+    # output is captured and printed in one block so parallel steps don't interleave
+    p = subprocess.run([sys.executable, script, "--series", series],
+                       stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    print(f"===== {name} (exit {p.returncode}, {time.monotonic() - t0:.1f}s) =====")
+    print(p.stdout, end="", flush=True)
+    return p.returncode
+
+def run(series: str) -> list[str]:
+    """Run every stage once its prerequisites succeeded; returns the names that failed or were skipped."""
+    done, failed = set(), set()
+    pending = {}
+    with ThreadPoolExecutor(max_workers=len(STAGES)) as ex:
+        def launch():
+            for name, (_, deps) in STAGES.items():
+                if name in done or name in failed or name in pending.values():
+                    continue
+                if any(d in failed for d in deps):
+                    print(f"[pipeline] skip {name}: {', '.join(d for d in deps if d in failed)} failed")
+                    failed.add(name)
+                elif all(d in done for d in deps):
+                    pending[ex.submit(run_stage, name, series)] = name
+        launch()
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                name = pending.pop(fut)
+                (done if fut.result() == 0 else failed).add(name)
+            launch()
+    return [n for n in STAGES if n in failed]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--series", required=True)
+    args = ap.parse_args()
+
+    failed = run(args.series)
+    if failed:
+        raise SystemExit(f"[pipeline] failed: {', '.join(failed)}")
+    print("[pipeline] all steps done")
+
+if __name__ == "__main__":
+    main()
@@ -13,21 +13,38 @@ ENV
   PYTHONPATH should include repo root so adapters import cleanly.
 """
 from __future__ import annotations
-import argparse, json, os, subprocess, tempfile
+import argparse, importlib, importlib.util, json, os, subprocess, tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
+
+try:  # orjson when installed, else stdlib json
+    import orjson as _json
+except ImportError:
+    _json = json
+
+from _ep import latest_ep
 
 FFMPEG = os.environ.get("FFMPEG", "ffmpeg")
 
-# Adapters: try package then top-level
+# Adapters: package if importable, else top-level. Resolved once per process
+# (beats call this per shot), and a spec lookup instead of a failed import, so
+# an error raised inside an adapter isn't mistaken for "not found".
+@lru_cache(maxsize=None)
 def _import_adapter(modname: str):
     try:
-        return __import__(f"adapters.{modname}", fromlist=["*"])
-    except Exception:
-        return __import__(modname)
+        found = importlib.util.find_spec(f"adapters.{modname}") is not None
+    except ModuleNotFoundError:  # no adapters package on sys.path
+        found = False
+    return importlib.import_module(f"adapters.{modname}" if found else modname)
+
+# _concat stream-copies the shots, so every shot (adapter or fallback) must come out
+# as the same libx264 yuv420p 1080x1920 stream at one frame rate
+SHOT_FPS = 24
 
 def _load_shotlist(p: Path) -> List[Dict]:
-    data = json.loads(p.read_text(encoding="utf-8"))
+    data = _json.loads(p.read_bytes())
     if isinstance(data, dict) and "beats" in data: return data["beats"]
     if isinstance(data, list): return data
     return [{"text": str(data), "keywords": [], "title": "Beat", "duration": 6.0}]
@@ -46,6 +63,56 @@ def _concat(shots: List[Path], out_path: Path) -> None:
         try: lst.unlink()
         except Exception: pass
 
+def _render_beat(shot: Tuple[int, Dict, str, Path], threads: str) -> Path:
+    """One beat → one shot file. Runs in a worker process (see build_all)."""
+    i, b, kind, out = shot
+    text = (b.get("text") or "").strip()
+    title = (b.get("title") or "").strip()
+    kws = b.get("keywords") or []
+    dur = float(b.get("duration") or 6.0)
+
+    try:
+        if kind == "la":
+            # Linear algebra visuals first; fallback to chart/flow
+            print(f"[router] beat {i}: LA_VIZ d={dur:.1f}s kws={kws[:4]}")
+            _import_adapter("la_viz").render(text=text or title, out_path=out, duration=dur, fps=SHOT_FPS)
+        elif kind == "mas":
+            print(f"[router] beat {i}: MAS_VIZ d={dur:.1f}s kws={kws[:4]}")
+            _import_adapter("mas_viz").render(text=text or title, out_path=out, duration=dur, fps=SHOT_FPS)
+        else:
+            # Generic fallbacks
+            if i % 2 == 0:
+                print(f"[router] beat {i}: FLOW d={dur:.1f}s")
+                _import_adapter("diagram_flow").render(text=text or title, out_path=out, duration=dur, fps=SHOT_FPS)
+            else:
+                print(f"[router] beat {i}: CHART d={dur:.1f}s")
+                _import_adapter("chart_simple").render(text=text or title, out_path=out, duration=dur, fps=SHOT_FPS)
+    except Exception as e:
+        print(f"[router] ERROR beat {i}: {e} → fallback solid")
+        subprocess.run([FFMPEG, "-y", "-f", "lavfi", "-i", f"color=c=0x101426:s=1080x1920:r={SHOT_FPS}:d={dur:.2f}",
+                        "-an", "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p",
+                        "-threads", threads, str(out)], check=False)
+    return out
+
+def build_all(shots: List[Tuple[int, Dict, str, Path]]) -> List[Path]:
+    """
+    Beats are independent, so render them in parallel (processes: matplotlib
+    and the GIL). Each encode is capped at FFMPEG_THREADS so workers x threads
+    stays within the cores. Paths come back in beat order. One or two beats
+    render in-process: a pool would cost more to start than it saves, and
+    each encode keeps ffmpeg's own threading.
+    """
+    # sized here, not at import, so --help and argparse errors skip the adapters
+    ff = _import_adapter("_ffmpeg")
+    workers = ff.POOL_WORKERS
+    threads = str(ff.ffmpeg_thread_budget(workers))  # per encode while `workers` shots render at once
+    render = partial(_render_beat, threads=threads)
+    if len(shots) <= 2:
+        return [render(s) for s in shots]
+    os.environ.setdefault("FFMPEG_THREADS", threads)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(render, shots))
+
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--series", required=True)
@@ -53,13 +120,10 @@ def main() -> int:
     args = ap.parse_args()
 
     series = args.series
-    series_dir = Path("out") / series
-    plans = sorted(series_dir.glob("ep_*/plan.json"))
-    if not plans:
-        print(f"[router] ERROR: no plan.json under {series_dir}/ep_*/")
+    ep_dir = latest_ep(series)
+    if ep_dir is None:
+        print(f"[router] ERROR: no plan.json under out/{series}/ep_*/")
         return 1
-    plan_path = plans[-1]
-    ep_dir = plan_path.parent
     assets = ep_dir / "assets"
     shots_dir = assets / "shots"
     visuals = assets / "visuals.mp4"
@@ -73,41 +137,8 @@ def main() -> int:
     is_math = series in ("math_of_ML", "ai_teacher", "ai_teacher_linear_algebra")
     is_mas  = series in ("MAS", "ai_teacher_mas")
 
-    la = _import_adapter("la_viz")
-    mas = _import_adapter("mas_viz")
-    flow = _import_adapter("diagram_flow")
-    chart = _import_adapter("chart_simple")
-
-    made: List[Path] = []
-    for i, b in enumerate(beats):
-        text = (b.get("text") or "").strip()
-        title = (b.get("title") or "").strip()
-        kws = b.get("keywords") or []
-        dur = float(b.get("duration") or 6.0)
-        out = shots_dir / f"{i:03d}.mp4"
-
-        try:
-            if is_math:
-                # Linear algebra visuals first; fallback to chart/flow
-                print(f"[router] beat {i}: LA_VIZ d={dur:.1f}s kws={kws[:4]}")
-                la.render(text=text or title, out_path=out, duration=dur)
-            elif is_mas:
-                print(f"[router] beat {i}: MAS_VIZ d={dur:.1f}s kws={kws[:4]}")
-                mas.render(text=text or title, out_path=out, duration=dur)
-            else:
-                # Generic fallbacks
-                if i % 2 == 0:
-                    print(f"[router] beat {i}: FLOW d={dur:.1f}s")
-                    flow.render(text=text or title, out_path=out, duration=dur)
-                else:
-                    print(f"[router] beat {i}: CHART d={dur:.1f}s")
-                    chart.render(text=text or title, out_path=out, duration=dur)
-        except Exception as e:
-            print(f"[router] ERROR beat {i}: {e} → fallback solid")
-            subprocess.run([FFMPEG, "-y", "-f", "lavfi", "-i", f"color=c=0x101426:s=1080x1920:d={dur:.2f}",
-                            "-c:v", "libx264", "-pix_fmt", "yuv420p", str(out)], check=False)
-
-        made.append(out)
+    kind = "la" if is_math else "mas" if is_mas else "generic"
+    made = build_all([(i, b, kind, shots_dir / f"{i:03d}.mp4") for i, b in enumerate(beats)])
 
     if not made:
         print("[router] ERROR: no shots produced.")
@@ -1,7 +1,10 @@
 # generator/select_stock.py
 import argparse, json, os, random, re, subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from _ep import latest_ep
+
 FFPROBE = "ffprobe"
 
 def probe_dur(p: Path) -> float:
@@ -15,9 +18,10 @@ def probe_dur(p: Path) -> float:
     except Exception:
         return 0.0
 
+_TOKEN_RE = re.compile(r"[a-z0-9_]+")
+
 def tokens_from(text: str) -> set:
-    words = re.findall(r"[a-z0-9_]+", (text or "").lower())
-    return set(words)
+    return set(_TOKEN_RE.findall((text or "").lower()))
 
 def main():
     ap = argparse.ArgumentParser()
@@ -26,9 +30,10 @@ def main():
     args = ap.parse_args()
 
     series = args.series
-    out_dir = Path("out") / series
-    plan_path = sorted(out_dir.glob("ep_*/plan.json"))[-1]
-    ep_dir = plan_path.parent
+    ep_dir = latest_ep(series)
+    if ep_dir is None:
+        raise SystemExit(f"No plan.json found in out/{series}/ep_*/")
+    plan_path = ep_dir / "plan.json"
     assets = ep_dir / "assets"
     assets.mkdir(parents=True, exist_ok=True)
 
@@ -56,11 +61,13 @@ def main():
         return
 
     # Score by simple tag overlap (filename tokens)
+    # ffprobe calls are independent; run them concurrently (map keeps order)
+    with ThreadPoolExecutor(max_workers=min(len(files), os.cpu_count() or 4)) as ex:
+        durs = list(ex.map(probe_dur, files))
     scored = []
-    for p in files:
+    for p, dur in zip(files, durs):
         name_tok = tokens_from(p.stem)
         score = len(tok & name_tok)
-        dur = probe_dur(p)
         scored.append((score, dur, p))
     scored.sort(key=lambda x: (x[0], x[1]), reverse=True)
 
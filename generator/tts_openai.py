@@ -1,10 +1,16 @@
 # generator/tts_openai.py
 import os
+from functools import lru_cache
 from openai import OpenAI
 
 OPENAI_TTS_MODEL = os.environ.get("OPENAI_TTS_MODEL", "gpt-4o-mini-tts")
 OPENAI_TTS_VOICE = os.environ.get("OPENAI_TTS_VOICE", "verse") #alloy, verse, sage
 
+@lru_cache(maxsize=1)
+def _client(api_key: str) -> OpenAI:
+    # one client (and its keep-alive connection pool) shared by every chunk/thread
+    return OpenAI(api_key=api_key)
+
 def synthesize(text: str, out_path: str) -> None:
     """
     Generate natural speech with OpenAI TTS and write a WAV file to out_path.
@@ -13,16 +19,14 @@ def synthesize(text: str, out_path: str) -> None:
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY not set")
 
-    client = OpenAI(api_key=api_key)
+    client = _client(api_key)
 
     # Response format "wav" so we get raw PCM WAV (easy to mix with ffmpeg)
-    resp = client.audio.speech.create(
+    with client.audio.speech.with_streaming_response.create(
         model=OPENAI_TTS_MODEL,
         voice=OPENAI_TTS_VOICE,
         input=text,
         response_format="wav",
-    )
-    # SDK returns bytes-like; write straight to disk
-    audio_bytes = resp.read()
-    with open(out_path, "wb") as f:
-        f.write(audio_bytes)
+    ) as resp:
+        # written as it arrives instead of buffering the whole clip in memory
+        resp.stream_to_file(out_path)
@@ -8,6 +8,12 @@ from pathlib import Path
 
 import requests  # needed for API call
 
+try:
+    from generator._ep import latest_ep
+except ImportError:  # run as a script: put the repo root on sys.path
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from generator._ep import latest_ep
+
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 MODEL = os.environ.get("OPENAI_MODEL", "gpt-4o")
 
@@ -47,10 +53,9 @@ def call_openai(prompt: str) -> str:
     return r.json()["choices"][0]["message"]["content"]
 
 def ensure_plan(series: str) -> Path:
-    out_dir = Path("out") / series
-    plans = sorted(out_dir.glob("ep_*/plan.json"))
-    if plans:
-        return plans[-1]
+    ep = latest_ep(series)
+    if ep is not None:
+        return ep / "plan.json"
 
     # No plan.json yet → call planner
     print(f"[agent] No plan.json found for {series}. Running planner…")
@@ -63,10 +68,10 @@ def ensure_plan(series: str) -> Path:
         print(res.stderr, file=sys.stderr)
         raise SystemExit(f"[agent] planner failed for {series} (exit {res.returncode})")
 
-    plans = sorted(out_dir.glob("ep_*/plan.json"))
-    if not plans:
+    ep = latest_ep(series)
+    if ep is None:
         raise SystemExit(f"[agent] planner ran but still no plan.json in out/{series}/ep_*/")
-    return plans[-1]
+    return ep / "plan.json"
 
 def load_text(p: Path) -> str:
     try:
@@ -1,10 +1,17 @@
 # planner/make_shotlist.py
-import argparse, json, os
+import argparse, hashlib, json, os, sys
 from pathlib import Path
 import requests
 
+try:
+    from generator._ep import latest_ep
+except ImportError:  # run as a script: put the repo root on sys.path
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from generator._ep import latest_ep
+
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
 MODEL = os.environ.get("OPENAI_MODEL", "gpt-4o")
+LLM_CACHE_DIR = Path("out") / ".llm_cache"  # raw replies by prompt hash; reruns skip the API
 
 SYS = """You convert short narration into a compact shot list for a vertical 9:16 video.
 Return JSON with key "beats": an array of beats:
@@ -32,6 +39,13 @@ def call_openai(narration: str):
             beats.append({"start": i*6, "dur": 6, "type": "slide", "keywords": ["general","topic"], "text": seg[:40]})
         return {"beats": beats}
 
+    user = USER_TMPL.format(narr=narration)
+    key = hashlib.sha256(f"{SYS}|{user}|{MODEL}".encode("utf-8")).hexdigest()
+    cached = LLM_CACHE_DIR / f"{key}.txt"
+    if cached.exists():
+        print(f"[shotlist] cache hit {cached.name}")
+        return json.loads(cached.read_text(encoding="utf-8"))
+
     url = "https://api.openai.com/v1/chat/completions"
     headers = {"Authorization": f"Bearer {OPENAI_API_KEY}", "Content-Type": "application/json"}
     body = {
@@ -39,13 +53,22 @@ def call_openai(narration: str):
         "response_format": {"type": "json_object"},
         "messages": [
             {"role":"system","content":SYS},
-            {"role":"user","content":USER_TMPL.format(narr=narration)}
+            {"role":"user","content":user}
         ],
         "temperature": 0.5,
     }
     r = requests.post(url, headers=headers, json=body, timeout=60)
     r.raise_for_status()
-    return json.loads(r.json()["choices"][0]["message"]["content"])
+    raw = r.json()["choices"][0]["message"]["content"]
+    data = json.loads(raw)  # only cache replies that parse
+    try:
+        LLM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+        tmp.write_text(raw, encoding="utf-8")
+        os.replace(tmp, cached)
+    except OSError as e:
+        print(f"[shotlist] cache write skipped: {e}")
+    return data
 
 def main():
     ap = argparse.ArgumentParser()
@@ -54,8 +77,9 @@ def main():
 
     # find latest episode assets
     series_dir = Path("out") / args.series
-    plan = sorted(series_dir.glob("ep_*/plan.json"))[-1]
-    ep_dir = plan.parent
+    ep_dir = latest_ep(args.series)
+    if ep_dir is None:
+        raise SystemExit(f"No plan.json found in {series_dir}/ep_*/")
     assets = ep_dir / "assets"
     assets.mkdir(parents=True, exist_ok=True)
 
@@ -1,6 +1,12 @@
-import argparse, json
+import argparse, json, sys
 from pathlib import Path
 
+try:
+    from generator._ep import latest_ep
+except ImportError:  # run as a script: put the repo root on sys.path
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from generator._ep import latest_ep
+
 def post_instagram(mp4_path, caption):
     print(f"[post] instagram -> {mp4_path}")
     return {"platform":"instagram","post_id":"fake_ig_123","url":"https://instagram.com/fake"}
@@ -14,7 +20,10 @@ def main():
     ap.add_argument("--series", required=True)
     args = ap.parse_args()
 
-    plan_path = sorted(Path(f"out/{args.series}").glob("ep_*/plan.json"))[-1]
+    ep = latest_ep(args.series)
+    if ep is None:
+        raise SystemExit(f"No plan.json found in out/{args.series}/ep_*/")
+    plan_path = ep / "plan.json"
     plan = json.loads(Path(plan_path).read_text(encoding="utf-8"))
     ep_dir = Path(plan_path).parent
     mp4 = ep_dir.parent / "final" / f"{ep_dir.name}.mp4"
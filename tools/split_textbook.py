@@ -39,18 +39,22 @@ PDFS = ROOT / "data" / "textbooks"
 
 # ---------------- Utility helpers ----------------
 
+_NON_SLUG_RE = re.compile(r"[^a-z0-9]+")     # runs of these collapse to a single "-"
+_HYPHEN_BREAK_RE = re.compile(r"(\w)-\n(\w)")
+_HSPACE_RE = re.compile(r"[ \t]+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
 def _slugify(s: str) -> str:
     s = s.strip().lower()
-    s = re.sub(r"[^a-z0-9]+", "-", s)
-    return re.sub(r"-+", "-", s).strip("-") or "section"
+    return _NON_SLUG_RE.sub("-", s).strip("-") or "section"
 
 def _normalize_text(s: str) -> str:
     # Lightweight cleanup: join hyphenated words, drop repeated whitespace, remove page headers/footers heuristically.
     s = s.replace("\r\n", "\n").replace("\r", "\n")
     # Remove line endings that look like forced hyphenation: "lin-" "\n" "e"
-    s = re.sub(r"(\w)-\n(\w)", r"\1\2", s)
-    s = re.sub(r"[ \t]+", " ", s)
-    s = re.sub(r"\n{3,}", "\n\n", s)
+    s = _HYPHEN_BREAK_RE.sub(r"\1\2", s)
+    s = _HSPACE_RE.sub(" ", s)
+    s = _BLANK_LINES_RE.sub("\n\n", s)
     return s.strip()
 
 def _read_index(book_slug: str) -> Dict: